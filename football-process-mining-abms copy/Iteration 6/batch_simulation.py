@@ -3,21 +3,96 @@ Batch Football Simulation - 30 Games Analysis
 Run multiple football matches and perform comprehensive process mining analysis
 """
 import os
+import multiprocessing as mp
 import pandas as pd
-import pm4py
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 from football_model import FootballModel
-from process_mining_analysis import FootballProcessMiner
 import warnings
 warnings.filterwarnings('ignore')
 
+
+# Match i of a batch is seeded SEED_BASE + i
+SEED_BASE = 42
+
+
+def simulate_match(seed: int, tags: dict) -> Tuple[List[dict], int, int, int]:
+    """Simulate one 45-minute match, tagging each event with tags.
+    
+    Returns (events, home goals, away goals, possessions), tallied in the same pass.
+    Module-level so worker processes can pickle it; both batch drivers use it.
+    """
+    model = FootballModel(match_duration_minutes=45, seed=seed, collect_every=0)
+    model.run_to_end()
+    
+    events = model.logger.events
+    home_goals = away_goals = 0
+    possessions = set()
+    for event in events:
+        event.update(tags)
+        
+        possession_id = event.get('possession_id')
+        if possession_id:
+            possessions.add(possession_id)
+        if event.get('action') == 'Goal':
+            if event.get('team') == 'Home':
+                home_goals += 1
+            elif event.get('team') == 'Away':
+                away_goals += 1
+    
+    return events, home_goals, away_goals, len(possessions)
+
+
+def match_result_label(home_goals: int, away_goals: int) -> str:
+    """'Home Win', 'Away Win' or 'Draw' for a final score"""
+    return 'Home Win' if home_goals > away_goals else 'Away Win' if away_goals > home_goals else 'Draw'
+
+
+def run_in_pool(func, items, processes: Optional[int] = None):
+    """Yield func(item) for each item in order, computed in worker processes (processes=1 runs in-process)"""
+    if processes == 1:
+        yield from map(func, items)
+        return
+    
+    # fork (where available) lets workers reuse the already-imported modules
+    context = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count(), mp_context=context) as executor:
+        # map() yields in submission order, so callers see results in match order
+        yield from executor.map(func, items)
+
+
+def run_one_game(match_id: int, seed: Optional[int] = None) -> Tuple[List[dict], dict]:
+    """Simulate one match and return its tagged events and result"""
+    if seed is None:
+        seed = SEED_BASE + match_id  # Different seed for each match
+    
+    events, home_score, away_score, possessions = simulate_match(
+        seed, {'match_id': f"M{match_id + 1:02d}", 'match_seed': seed})
+    
+    match_result = {
+        'match_id': match_id + 1,
+        'seed': seed,
+        'home_score': home_score,
+        'away_score': away_score,
+        'total_events': len(events),
+        'total_possessions': possessions,
+        'duration_minutes': 45,
+        'result': match_result_label(home_score, away_score)
+    }
+    
+    return events, match_result
+
+
 class BatchFootballSimulation:
     """Run multiple football matches for comprehensive process mining analysis"""
     
-    def __init__(self, num_games: int = 30, output_dir: str = "batch_outputs"):
+    def __init__(self, num_games: int = 30, output_dir: str = "batch_outputs",
+                 processes: Optional[int] = None):
         self.num_games = num_games
         self.output_dir = output_dir
         self.analysis_dir = "batch_analysis"
+        self.processes = processes or os.cpu_count()  # 1 = run matches in this process
         os.makedirs(self.output_dir, exist_ok=True)
         os.makedirs(self.analysis_dir, exist_ok=True)
         
@@ -27,53 +102,20 @@ class BatchFootballSimulation:
         
     def run_single_match(self, match_id: int, seed: int = None) -> dict:
         """Run a single football match and return results"""
-        if seed is None:
-            seed = 42 + match_id  # Different seed for each match
-            
-        print(f"🏈 Running Match {match_id + 1}/{self.num_games} (seed: {seed})")
-        
-        # Create and run match
-        model = FootballModel(match_duration_minutes=45, seed=seed)
-        
-        # Run the match
-        step_count = 0
-        while model.running and step_count < model.total_steps:
-            model.step()
-            step_count += 1
-        
-        # Get match results
-        events = model.logger.events.copy()
-        
-        # Add match identifier to each event
-        for event in events:
-            event['match_id'] = f"M{match_id + 1:02d}"
-            event['match_seed'] = seed
-        
-        # Calculate match statistics
-        home_score = sum(1 for e in events if e.get('action') == 'Goal' and e.get('team') == 'Home')
-        away_score = sum(1 for e in events if e.get('action') == 'Goal' and e.get('team') == 'Away')
-        
-        total_possessions = len(set(e.get('possession_id', '') for e in events if e.get('possession_id')))
-        total_events = len(events)
-        
-        match_result = {
-            'match_id': match_id + 1,
-            'seed': seed,
-            'home_score': home_score,
-            'away_score': away_score,
-            'total_events': total_events,
-            'total_possessions': total_possessions,
-            'duration_minutes': 45,
-            'result': 'Home Win' if home_score > away_score else 'Away Win' if away_score > home_score else 'Draw'
-        }
-        
-        print(f"   ⚽ Result: {match_result['result']} ({home_score}-{away_score})")
-        print(f"   📊 Events: {total_events}, Possessions: {total_possessions}")
+        print(f"🏈 Running Match {match_id + 1}/{self.num_games} (seed: {seed if seed is not None else SEED_BASE + match_id})")
+        
+        events, match_result = run_one_game(match_id, seed)
+        self._print_match_result(match_result)
         
         return events, match_result
     
+    def _print_match_result(self, match_result: dict):
+        """Print the one-line score and event summary for a match"""
+        print(f"   ⚽ Result: {match_result['result']} ({match_result['home_score']}-{match_result['away_score']})")
+        print(f"   📊 Events: {match_result['total_events']}, Possessions: {match_result['total_possessions']}")
+    
     def run_batch_simulation(self):
-        """Run all matches in the batch"""
+        """Run all matches in the batch (independent matches run in parallel worker processes)"""
         print("🏆 BATCH FOOTBALL SIMULATION")
         print("=" * 50)
         print(f"Running {self.num_games} matches for comprehensive analysis...")
@@ -81,8 +123,20 @@ class BatchFootballSimulation:
         
         start_time = datetime.now()
         
-        for match_id in range(self.num_games):
-            events, result = self.run_single_match(match_id)
+        # Results arrive in match order, so combined_events stays ordered by match
+        self._collect_results(run_in_pool(run_one_game, range(self.num_games), self.processes), start_time)
+        
+        total_time = datetime.now() - start_time
+        print(f"✅ Batch simulation complete!")
+        print(f"⏱️  Total time: {total_time.total_seconds():.1f} seconds")
+        print(f"📊 Total events generated: {len(self.combined_events)}")
+        print()
+    
+    def _collect_results(self, results, start_time: datetime):
+        """Gather (events, result) pairs in match order, reporting progress as they arrive"""
+        for match_id, (events, result) in enumerate(results):
+            print(f"🏈 Match {match_id + 1}/{self.num_games} (seed: {result['seed']})")
+            self._print_match_result(result)
             
             # Add to combined data
             self.combined_events.extend(events)
@@ -97,12 +151,6 @@ class BatchFootballSimulation:
                 print(f"   🕐 Estimated time remaining: {remaining_time:.1f} seconds")
                 print()
         
-        total_time = datetime.now() - start_time
-        print(f"✅ Batch simulation complete!")
-        print(f"⏱️  Total time: {total_time.total_seconds():.1f} seconds")
-        print(f"📊 Total events generated: {len(self.combined_events)}")
-        print()
-        
     def export_combined_data(self):
         """Export combined data from all matches"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -119,8 +167,7 @@ class BatchFootballSimulation:
             xes_path = f"{self.output_dir}/batch_matches_{timestamp}.xes"
             
             # Prepare for XES export
-            df_xes = df.copy()
-            df_xes = df_xes.rename(columns={
+            df_xes = df.rename(columns={  # rename already returns a new frame
                 'possession_id': 'case:concept:name',
                 'action': 'concept:name',
                 'timestamp': 'time:timestamp'
@@ -130,8 +177,9 @@ class BatchFootballSimulation:
             if 'time:timestamp' in df_xes.columns:
                 df_xes['time:timestamp'] = pd.to_datetime(df_xes['time:timestamp'])
             
-            # Convert to event log and export
+            # Convert to event log and export (pm4py imported here so the match workers never load it)
             try:
+                import pm4py
                 event_log = pm4py.convert_to_event_log(df_xes)
                 pm4py.write_xes(event_log, xes_path)
                 print(f"📊 Combined XES exported: {xes_path}")
@@ -172,7 +220,8 @@ class BatchFootballSimulation:
         print(f"\n🔬 RUNNING PROCESS MINING ANALYSIS")
         print("=" * 50)
         
-        # Create process miner and run batch analysis
+        # Create process miner and run batch analysis (imported here: it loads pyplot, seaborn and pm4py)
+        from process_mining_analysis import FootballProcessMiner
         miner = FootballProcessMiner(output_dir=self.output_dir)
         results = miner.run_batch_analysis()
         
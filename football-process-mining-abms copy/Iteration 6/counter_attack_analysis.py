@@ -34,8 +34,8 @@ def analyze_counter_attack_patterns():
     
     # 2. Counter-attack success rate analysis
     ca_shots = counter_events[counter_events['activity'] == 'CounterAttackShot']
-    goals = len(ca_shots[ca_shots['outcome'] == 'Goal'])
-    on_target = len(ca_shots[ca_shots['outcome'] == 'OnTarget'])
+    goals = np.count_nonzero(ca_shots['outcome'] == 'Goal')
+    on_target = np.count_nonzero(ca_shots['outcome'] == 'OnTarget')
     total_shots = len(ca_shots)
     
     print(f"\n2. COUNTER-ATTACK EFFECTIVENESS:")
@@ -105,16 +105,16 @@ def analyze_counter_attack_patterns():
     print(f"   Away team events: {len(away_events)}")
     
     # Goals comparison
-    home_goals = len(home_events[(home_events['activity'] == 'Shot') & (home_events['outcome'] == 'Goal')])
-    away_goals = len(away_events[(away_events['activity'] == 'Shot') & (away_events['outcome'] == 'Goal')])
+    home_goals = np.count_nonzero((home_events['activity'] == 'Shot') & (home_events['outcome'] == 'Goal'))
+    away_goals = np.count_nonzero((away_events['activity'] == 'Shot') & (away_events['outcome'] == 'Goal'))
     
     print(f"   Home team goals: {home_goals}")
     print(f"   Away team goals: {away_goals}")
     print(f"   Home team advantage: {home_goals - away_goals} goals")
     
     # Shot statistics
-    home_shots = len(home_events[home_events['activity'].str.contains('Shot', na=False)])
-    away_shots = len(away_events[away_events['activity'].str.contains('Shot', na=False)])
+    home_shots = np.count_nonzero(home_events['activity'].str.contains('Shot', na=False))
+    away_shots = np.count_nonzero(away_events['activity'].str.contains('Shot', na=False))
     
     print(f"   Home team shots: {home_shots}")
     print(f"   Away team shots: {away_shots}")
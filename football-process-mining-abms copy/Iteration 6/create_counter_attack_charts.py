@@ -10,6 +10,20 @@ import seaborn as sns
 import numpy as np
 from collections import Counter
 
+try:
+    import pyarrow  # noqa: F401 - enables pandas' multithreaded Arrow CSV parser
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# Only these columns are used; the low-cardinality ones are parsed straight to category
+CHART_COLUMNS = ['match_id', 'team', 'action', 'outcome', 'zone']
+CHART_DTYPES = {'team': 'category', 'action': 'category', 'outcome': 'category'}
+
+# Simulated actions whose names contain 'Shot' / 'CounterAttack'
+SHOT_ACTIONS = frozenset({'Shot', 'CounterAttackShot'})
+COUNTER_ATTACK_ACTIONS = frozenset({'CounterAttackPass', 'CounterAttackDribble', 'CounterAttackShot'})
+
 # Set style for better plots
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
@@ -18,16 +32,21 @@ def create_counter_attack_visualizations():
     """Create comprehensive visualizations of counter-attack analysis"""
     
     # Load data
-    df = pd.read_csv('batch_outputs/football_30games_20250616_213147.csv')
+    df = pd.read_csv('batch_outputs/football_30games_20250616_213147.csv',
+                     usecols=CHART_COLUMNS, dtype=CHART_DTYPES, engine=CSV_ENGINE)
+    
+    # Row selections shared by the charts and the summary, computed once
+    is_shot = df['action'].isin(SHOT_ACTIONS)
+    goals = df[is_shot & (df['outcome'] == 'Goal')]
+    match_goals = goals.groupby(['match_id', 'team'], observed=True).size().unstack(fill_value=0)
+    home_shot_count = np.count_nonzero(is_shot & (df['team'] == 'Home'))
+    away_shot_count = np.count_nonzero(is_shot & (df['team'] == 'Away'))
     
     # Create figure with subplots
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12), constrained_layout=True)
     fig.suptitle('Counter-Attack Spike Tactic Analysis - 30 Games', fontsize=16, fontweight='bold')
     
     # 1. Goals per match comparison
-    goals = df[(df['action'].str.contains('Shot', na=False)) & (df['outcome'] == 'Goal')]
-    match_goals = goals.groupby(['match_id', 'team']).size().unstack(fill_value=0)
-    
     matches = range(1, len(match_goals) + 1)
     home_goals = match_goals['Home'].values
     away_goals = match_goals['Away'].values
@@ -41,17 +60,14 @@ def create_counter_attack_visualizations():
     ax1.grid(True, alpha=0.3)
     
     # Add summary stats
-    home_total = sum(home_goals)
-    away_total = sum(away_goals)
+    home_total = home_goals.sum()
+    away_total = away_goals.sum()
     ax1.text(0.02, 0.98, f'Total: Home {home_total}, Away {away_total}', 
              transform=ax1.transAxes, verticalalignment='top', fontsize=10,
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
     # 2. Shot comparison
-    home_shots = df[(df['team'] == 'Home') & (df['action'].str.contains('Shot', na=False))]
-    away_shots = df[(df['team'] == 'Away') & (df['action'].str.contains('Shot', na=False))]
-    
-    shot_data = [len(home_shots), len(away_shots)]
+    shot_data = [home_shot_count, away_shot_count]
     teams = ['Home\n(Counter-Attack)', 'Away\n(Baseline)']
     colors = ['red', 'blue']
     
@@ -66,10 +82,11 @@ def create_counter_attack_visualizations():
                 ha='center', va='bottom', fontweight='bold')
     
     # 3. Counter-attack event analysis
-    counter_events = df[df['action'].str.contains('CounterAttack', na=False)]
+    counter_events = df[df['action'].isin(COUNTER_ATTACK_ACTIONS)]
     
     # Counter-attack shots by zone
     ca_shots = counter_events[counter_events['action'] == 'CounterAttackShot']
+    ca_goals = np.count_nonzero(ca_shots['outcome'] == 'Goal')
     zone_counts = ca_shots['zone'].value_counts()
     
     if len(zone_counts) > 0:
@@ -80,7 +97,6 @@ def create_counter_attack_visualizations():
         ax3.grid(True, alpha=0.3)
         
         # Add total and goal info
-        ca_goals = len(ca_shots[ca_shots['outcome'] == 'Goal'])
         ax3.text(0.02, 0.98, f'Total CA Shots: {len(ca_shots)}\nCA Goals: {ca_goals}', 
                  transform=ax3.transAxes, verticalalignment='top', fontsize=10,
                  bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
@@ -90,9 +106,9 @@ def create_counter_attack_visualizations():
         ax3.set_title('Counter-Attack Shots by Zone')
     
     # 4. Win/Loss/Draw analysis
-    home_wins = (match_goals['Home'] > match_goals['Away']).sum()
-    away_wins = (match_goals['Away'] > match_goals['Home']).sum()
-    draws = (match_goals['Home'] == match_goals['Away']).sum()
+    home_wins = np.count_nonzero(match_goals['Home'] > match_goals['Away'])
+    away_wins = np.count_nonzero(match_goals['Away'] > match_goals['Home'])
+    draws = np.count_nonzero(match_goals['Home'] == match_goals['Away'])
     
     results = [home_wins, away_wins, draws]
     result_labels = ['Home Wins', 'Away Wins', 'Draws']
@@ -108,8 +124,7 @@ def create_counter_attack_visualizations():
              transform=ax4.transAxes, verticalalignment='top', fontsize=10,
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
-    plt.tight_layout()
-    plt.savefig('process_analysis/counter_attack_analysis_charts.png', dpi=300, bbox_inches='tight')
+    plt.savefig('process_analysis/counter_attack_analysis_charts.png', dpi=150)
     plt.show()
     
     # Print summary statistics
@@ -118,11 +133,10 @@ def create_counter_attack_visualizations():
     print(f"Home team record: {home_wins}-{away_wins}-{draws}")
     print(f"Total goals: Home {home_total}, Away {away_total}")
     print(f"Goal differential: +{home_total - away_total} (Home advantage)")
-    print(f"Total shots: Home {len(home_shots)}, Away {len(away_shots)}")
+    print(f"Total shots: Home {home_shot_count}, Away {away_shot_count}")
     print(f"Counter-attack events: {len(counter_events)}")
     print(f"Counter-attack shots: {len(ca_shots)}")
     if len(ca_shots) > 0:
-        ca_goals = len(ca_shots[ca_shots['outcome'] == 'Goal'])
         print(f"Counter-attack goals: {ca_goals}")
         print(f"Counter-attack conversion rate: {100*ca_goals/len(ca_shots):.1f}%")
     
@@ -134,7 +148,7 @@ def create_counter_attack_visualizations():
         'home_goals': home_total,
         'away_goals': away_total,
         'counter_attack_events': len(counter_events),
-        'counter_attack_goals': ca_goals if len(ca_shots) > 0 else 0
+        'counter_attack_goals': ca_goals
     }
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 Football Field and Zone Management
 Defines the football field layout and zone system (A1-D5)
 """
+import sys
 import mesa
 import numpy as np
 from typing import Tuple, List, Dict, Any
@@ -46,6 +47,16 @@ class FootballField:
         self.width = width
         self.height = height
         self.zones = self._create_zone_mapping()
+        # The grid is static, so neighbour lists are computed once per zone
+        self._adjacent = {zone: tuple(self._compute_adjacent_zones(zone)) for zone in self.zones}
+        self._neighbourhood = {zone: (zone,) + adjacent for zone, adjacent in self._adjacent.items()}
+        # Adjacent zones towards each team's attacking end (zone names sort in pitch order, A1..D5)
+        self._forward = {
+            (team, zone): tuple(z for z in adjacent if (z > zone if team == "Home" else z < zone))
+            for team in ("Home", "Away")
+            for zone, adjacent in self._adjacent.items()
+        }
+        self._distance_to_goal_cache: Dict[Tuple[str, str], float] = {}
         
     def _create_zone_mapping(self) -> Dict[str, Dict[str, Any]]:
         """Create mapping between zones and field coordinates"""
@@ -59,7 +70,7 @@ class FootballField:
         
         for i, row in enumerate(rows):
             for j in range(1, 6):  # Columns 1-5
-                zone_name = f"{row}{j}"
+                zone_name = sys.intern(f"{row}{j}")  # Shared with the player zone tables
                 
                 # Calculate zone boundaries
                 x_start = j * zone_width - zone_width
@@ -110,8 +121,21 @@ class FootballField:
             return self.zones[zone]['center']
         return (self.width // 2, self.height // 2)  # Default center
     
-    def get_adjacent_zones(self, zone: str) -> List[str]:
-        """Get list of adjacent zones"""
+    def get_adjacent_zones(self, zone: str) -> Tuple[str, ...]:
+        """Get adjacent zones (cached tuple, empty for unknown zones)"""
+        return self._adjacent.get(zone, ())
+    
+    def get_zone_neighbourhood(self, zone: str) -> Tuple[str, ...]:
+        """Get a zone together with its adjacent zones (cached tuple)"""
+        neighbourhood = self._neighbourhood.get(zone)
+        return neighbourhood if neighbourhood is not None else (zone,)
+    
+    def get_forward_zones(self, team: str, zone: str) -> Tuple[str, ...]:
+        """Get adjacent zones in a team's attacking direction (cached tuple)"""
+        return self._forward.get((team, zone), ())
+    
+    def _compute_adjacent_zones(self, zone: str) -> List[str]:
+        """Compute the list of adjacent zones"""
         if zone not in self.zones:
             return []
             
@@ -132,7 +156,7 @@ class FootballField:
             
             if (0 <= new_row_idx < 4 and 1 <= new_col <= 5):
                 new_row = chr(ord('A') + new_row_idx)
-                adjacent_zone = f"{new_row}{new_col}"
+                adjacent_zone = sys.intern(f"{new_row}{new_col}")
                 adjacent.append(adjacent_zone)
                 
         return adjacent
@@ -147,6 +171,15 @@ class FootballField:
         
         return np.sqrt((center1[0] - center2[0])**2 + (center1[1] - center2[1])**2)
     
+    def distance_to_goal(self, team: str, zone: str) -> float:
+        """Distance from a zone to the goal a team attacks (memoized, the geometry is static)"""
+        key = (team, zone)
+        distance = self._distance_to_goal_cache.get(key)
+        if distance is None:
+            distance = self.calculate_distance(zone, self.get_goal_zone_for_team(team))
+            self._distance_to_goal_cache[key] = distance
+        return distance
+    
     def is_goal_scoring_zone(self, zone: str) -> bool:
         """Check if zone is in goal scoring area"""
         return zone in ['A2', 'A3', 'A4']  # Central goal area
@@ -182,6 +215,18 @@ class FootballField:
                 
         return min(pressure, 3)  # Cap at 3 for high pressure
     
+    def get_team_pressure_level(self, zone: str, zone_counts: Dict[Tuple[str, str], int],
+                                defending_team: str) -> int:
+        """Same as get_pressure_level, but from per-(zone, team) player counts"""
+        if zone not in self.zones:
+            return 0
+            
+        pressure = 2 * zone_counts[(zone, defending_team)]
+        for adjacent_zone in self.get_adjacent_zones(zone):
+            pressure += zone_counts[(adjacent_zone, defending_team)]
+            
+        return min(pressure, 3)  # Cap at 3 for high pressure
+    
     def get_goal_zone_for_team(self, team: str) -> str:
         """Get the goal zone for a team"""
         if team == "Home":
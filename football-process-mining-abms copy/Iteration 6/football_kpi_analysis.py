@@ -12,50 +12,212 @@ Date: June 22, 2025
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+import hashlib
 import os
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import pyarrow as pa  # multithreaded Arrow group-by for the event tally (pandas fallback below)
+except ImportError:
+    pa = None
+
 # Import our simulation modules
-from batch_simulation import BatchFootballSimulation
+from batch_simulation import SEED_BASE, BatchFootballSimulation
+
+# Action groups shared by the KPI sections
+SHOT_ACTIONS = ('Shot', 'Goal', 'CounterAttackShot')
+NON_TOUCH_ACTIONS = frozenset(('PossessionStart', 'PossessionEnd', 'MatchEnd'))
+
+# With run_analysis(use_cache=True), encoded event frames and match results are cached here
+# (next to this module), keyed by batch size and simulation fingerprint
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+# Sources whose edits change the simulated events (and so invalidate cached ones)
+SIMULATION_MODULES = ('football_model.py', 'player_agent.py', 'football_field.py',
+                      'utils_logger.py', 'batch_simulation.py')
+
+
+def simulation_fingerprint() -> str:
+    """Short hash of the simulation sources and seed base, so any edit to them misses the cache"""
+    digest = hashlib.sha1(f"seed_base={SEED_BASE}".encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in SIMULATION_MODULES:
+        with open(os.path.join(here, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+# Markdown KPI report, filled in one pass by str.format_map (sections index the kpi_report dicts)
+KPI_REPORT_TEMPLATE = """\
+# Football KPI Analysis Report - {num_games} Games
+
+**Generated:** {ts:%Y-%m-%d %H:%M:%S}
+**Total Games Analyzed:** {num_games}
+**Total Events:** {n_events:,}
+
+## Executive Summary
+
+This comprehensive analysis covers {num_games} simulated football matches, \
+generating {n_events:,} total events across all key performance indicators. \
+The analysis provides detailed insights into team performance across multiple dimensions.
+
+## 📊 Basic Match KPIs
+
+| Metric | Home Team | Away Team |
+|--------|-----------|----------|
+| **Total Points** | {basic[home_points_total]} | {basic[away_points_total]} |
+| **Points per Match** | {basic[home_points_per_match]:.2f} | {basic[away_points_per_match]:.2f} |
+| **Events per Game** | {basic[events_per_game]:.1f} | {basic[events_per_game]:.1f} |
+
+## ⚽ Expected Goals Analysis
+
+| Metric | Home Team | Away Team |
+|--------|-----------|----------|
+| **Expected Goals (xG)** | {xg[home_xg_total]:.2f} | {xg[away_xg_total]:.2f} |
+| **xG per Match** | {xg[home_xg_per_match]:.2f} | {xg[away_xg_per_match]:.2f} |
+| **Expected Goals Against (xGA)** | {xg[home_xga_total]:.2f} | {xg[away_xga_total]:.2f} |
+| **xGA per Match** | {xg[home_xga_per_match]:.2f} | {xg[away_xga_per_match]:.2f} |
+| **Expected Goal Difference (xGD)** | {xg[home_xgd_total]:.2f} | {xg[away_xgd_total]:.2f} |
+| **xGD per Match** | {xg[home_xgd_per_match]:.2f} | {xg[away_xgd_per_match]:.2f} |
+| **xGD per 90 minutes** | {xg[home_xgd_per_90]:.2f} | {xg[away_xgd_per_90]:.2f} |
+| **Actual Goals** | {xg[home_goals_total]} | {xg[away_goals_total]} |
+| **Goals per Match** | {xg[home_goals_per_match]:.2f} | {xg[away_goals_per_match]:.2f} |
+| **Goals - xG** | {xg[home_goals_minus_xg]:.2f} | {xg[away_goals_minus_xg]:.2f} |
+
+## 🎯 Shooting Performance
+
+| Metric | Home Team | Away Team |
+|--------|-----------|----------|
+| **Total Shots** | {shooting[home_shots_total]} | {shooting[away_shots_total]} |
+| **Shots per Game** | {shooting[home_shots_per_game]:.1f} | {shooting[away_shots_per_game]:.1f} |
+| **Shots on Target** | {shooting[home_shots_on_target]} | {shooting[away_shots_on_target]} |
+| **Shot Accuracy (%)** | {shooting[home_shot_accuracy]:.1f}% | {shooting[away_shot_accuracy]:.1f}% |
+| **Shot-Creating Actions** | {shooting[home_shot_creating_actions]} | {shooting[away_shot_creating_actions]} |
+| **Shot-Creating per Game** | {shooting[home_shot_creating_per_game]:.1f} | {shooting[away_shot_creating_per_game]:.1f} |
+
+**Average Shots per Game (Both Teams):** {shooting[average_shots_per_game]:.1f}
+
+## ⚽ Possession & Passing
+
+| Metric | Home Team | Away Team |
+|--------|-----------|----------|
+| **Possession (%)** | {possession[home_possession_pct]:.1f}% | {possession[away_possession_pct]:.1f}% |
+| **Total Touches** | {possession[home_touches_total]} | {possession[away_touches_total]} |
+| **Touches per Game** | {possession[home_touches_per_game]:.1f} | {possession[away_touches_per_game]:.1f} |
+| **Total Passes** | {possession[home_passes_total]} | {possession[away_passes_total]} |
+| **Passes per Game** | {possession[home_passes_per_game]:.1f} | {possession[away_passes_per_game]:.1f} |
+| **Pass Completion (%)** | {possession[home_pass_completion_pct]:.1f}% | {possession[away_pass_completion_pct]:.1f}% |
+
+## 🛡️ Defensive Performance
+
+| Metric | Home Team | Away Team |
+|--------|-----------|----------|
+| **Total Tackles** | {defensive[home_tackles_total]} | {defensive[away_tackles_total]} |
+| **Tackles per Game** | {defensive[home_tackles_per_game]:.1f} | {defensive[away_tackles_per_game]:.1f} |
+| **Tackle Success Rate (%)** | {defensive[home_tackle_success_pct]:.1f}% | {defensive[away_tackle_success_pct]:.1f}% |
+| **Interceptions** | {defensive[home_interceptions_total]} | {defensive[away_interceptions_total]} |
+| **Interceptions per Game** | {defensive[home_interceptions_per_game]:.1f} | {defensive[away_interceptions_per_game]:.1f} |
+| **Clearances** | {defensive[home_clearances_total]} | {defensive[away_clearances_total]} |
+| **Ball Recoveries** | {defensive[home_ball_recoveries_total]} | {defensive[away_ball_recoveries_total]} |
+
+## 🥅 Goalkeeping Performance
+
+| Metric | Home Goalkeeper | Away Goalkeeper |
+|--------|-----------------|----------------|
+| **Goals Conceded** | {gk[home_goals_conceded]} | {gk[away_goals_conceded]} |
+| **Goals Conceded per Game** | {gk[home_goals_conceded_per_game]:.2f} | {gk[away_goals_conceded_per_game]:.2f} |
+| **Shots Faced** | {gk[home_shots_faced]} | {gk[away_shots_faced]} |
+| **Saves Made** | {gk[home_saves]} | {gk[away_saves]} |
+| **Save Percentage (%)** | {gk[home_save_percentage]:.1f}% | {gk[away_save_percentage]:.1f}% |
+
+## 🔍 Key Performance Insights
+
+### Performance Analysis
+
+- **Superior Team:** {better_team} team shows better performance with {xgd_diff:.2f} higher xGD per match
+- **Shot Efficiency:** Home team converts {shooting[home_shot_accuracy]:.1f}% vs Away team {shooting[away_shot_accuracy]:.1f}%
+- **Possession Control:** Home {possession[home_possession_pct]:.1f}% vs Away {possession[away_possession_pct]:.1f}%
+- **Defensive Strength:** Home GK {gk[home_save_percentage]:.1f}% saves vs Away GK {gk[away_save_percentage]:.1f}% saves
+
+### Statistical Significance
+
+With {num_games} games analyzed, this dataset provides statistically significant insights:
+- **Sample Size:** {n_events:,} events across {num_games} matches
+- **Event Density:** {events_per_match:.1f} events per match on average
+- **Performance Consistency:** Results validated across multiple match scenarios
+
+## 📈 Tactical Recommendations
+
+Based on the KPI analysis, the following tactical adjustments are recommended:
+
+{shot_recommendation}{possession_recommendation}\
+- **Set Piece Focus:** Teams averaging {shooting[average_shots_per_game]:.1f} shots per game should maximize set piece opportunities
+- **Defensive Structure:** Current tackle success rates suggest room for improvement in defensive positioning
+
+---
+
+*This report was generated by the Football KPI Analysis System*
+*Analysis completed on {ts:%Y-%m-%d at %H:%M:%S}*
+"""
 
 class FootballKPIAnalyzer:
     """Comprehensive KPI analysis for football simulation data"""
     
-    def __init__(self, num_games: int = 30):
-        """Initialize the KPI analyzer"""
+    def __init__(self, num_games: int = 30, make_viz: bool = True):
+        """Initialize the KPI analyzer (make_viz=False skips the dashboard, e.g. in headless sweeps)"""
         self.num_games = num_games
+        self.make_viz = make_viz
         self.batch_sim = BatchFootballSimulation(num_games)
         self.combined_events = []
         self.match_results = []
         self.kpi_report = {}
+        self._event_counts = {}  # (team, action, outcome) -> number of events
+        self._masks = {}  # shared per-row boolean masks, built once per analysis run
+        self._fig, self._axes = None, None  # dashboard figure, reused across repeated runs
+        self._run_ts, self._run_ts_str = None, ""  # analysis time, shared by the output names and report body
+        
+    def run_analysis(self, use_cache: bool = False) -> str:
+        """Run complete KPI analysis and generate report.
         
-    def run_analysis(self) -> str:
-        """Run complete KPI analysis and generate report"""
+        With use_cache, a cached event frame from an earlier run replaces the batch
+        simulation; a cache hit then also skips the batch CSV/XES exports.
+        """
         print("🏆 FOOTBALL KPI ANALYSIS")
         print("=" * 60)
-        print(f"Running {self.num_games}-game batch simulation for comprehensive KPI analysis...")
-        print()
         
-        # Run batch simulation
-        start_time = datetime.now()
-        self.batch_sim.run_batch_simulation()
-        simulation_time = datetime.now() - start_time
+        df = self._load_cached_events() if use_cache else None
+        if df is None:
+            print(f"Running {self.num_games}-game batch simulation for comprehensive KPI analysis...")
+            print()
+            
+            # Run batch simulation
+            start_time = datetime.now()
+            self.batch_sim.run_batch_simulation()
+            simulation_time = datetime.now() - start_time
+            
+            # Get simulation data
+            self.combined_events = self.batch_sim.combined_events
+            self.match_results = self.batch_sim.match_results
+            
+            print(f"✅ Simulation completed in {simulation_time.total_seconds():.2f} seconds")
+            print(f"📊 Total events captured: {len(self.combined_events):,}")
+            print()
+            
+            # Convert to DataFrame for analysis
+            df = pd.DataFrame(self.combined_events)
+            self._encode_events(df)
+            if use_cache:
+                self._save_cached_events(df)
+        else:
+            self._encode_events(df)
         
-        # Get simulation data
-        self.combined_events = self.batch_sim.combined_events
-        self.match_results = self.batch_sim.match_results
+        # One analysis timestamp, so the dashboard and report file names match
+        self._run_ts = datetime.now()
+        self._run_ts_str = self._run_ts.strftime("%Y%m%d_%H%M%S")
         
-        print(f"✅ Simulation completed in {simulation_time.total_seconds():.2f} seconds")
-        print(f"📊 Total events captured: {len(self.combined_events):,}")
-        print()
-        
-        # Convert to DataFrame for analysis
-        df = pd.DataFrame(self.combined_events)
+        self._build_masks(df)
         
         # Calculate all KPIs
         self._calculate_basic_kpis(df)
@@ -66,7 +228,8 @@ class FootballKPIAnalyzer:
         self._calculate_goalkeeping_kpis(df)
         
         # Generate visualizations
-        self._create_kpi_visualizations(df)
+        if self.make_viz:
+            self._create_kpi_visualizations(df)
         
         # Generate comprehensive report
         report_path = self._generate_kpi_report(df)
@@ -76,6 +239,92 @@ class FootballKPIAnalyzer:
         
         return report_path
     
+    def _cache_paths(self) -> Tuple[str, str]:
+        """Parquet paths of the cached event frame and match results for this batch size and simulation"""
+        key = f"{self.num_games}_{simulation_fingerprint()}"
+        return (f"{CACHE_DIR}/events_{key}.parquet",
+                f"{CACHE_DIR}/match_results_{key}.parquet")
+    
+    def _load_cached_events(self) -> Optional[pd.DataFrame]:
+        """Load the cached encoded event frame and match results, or None if not cached"""
+        if pa is None:
+            return None  # Parquet needs pyarrow
+        events_path, results_path = self._cache_paths()
+        if not (os.path.exists(events_path) and os.path.exists(results_path)):
+            return None
+        
+        try:
+            df = pd.read_parquet(events_path)  # categorical columns come back as categoricals
+            match_results = pd.read_parquet(results_path).to_dict('records')
+        except (OSError, pa.ArrowException) as e:
+            print(f"⚠️  Event cache unreadable, re-simulating: {e}")
+            return None
+        self.match_results = match_results
+        print(f"♻️  Loaded {len(df):,} cached events from {events_path} (simulation skipped)")
+        print()
+        return df
+    
+    def _save_cached_events(self, df: pd.DataFrame):
+        """Cache the encoded event frame and match results for later runs"""
+        if pa is None:
+            return
+        events_path, results_path = self._cache_paths()
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            df.to_parquet(events_path)
+            pd.DataFrame(self.match_results).to_parquet(results_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"⚠️  Event cache not written: {e}")
+    
+    def _encode_events(self, df: pd.DataFrame):
+        """Make team/action/outcome categorical and tally events by (team, action, outcome) once"""
+        keys = ['team', 'action', 'outcome']
+        for column in keys:
+            df[column] = df[column].astype('category')
+        
+        if pa is None:
+            self._event_counts = df.groupby(keys, observed=True).size().to_dict()
+            return
+        
+        # Arrow keeps the categoricals as dictionary columns and counts them in one native kernel
+        table = pa.Table.from_pandas(df[keys], preserve_index=False)
+        tally = table.group_by(keys).aggregate([([], 'count_all')])
+        groups = zip(*(tally.column(column).to_pylist() for column in keys))
+        self._event_counts = {group: n for group, n in zip(groups, tally.column('count_all').to_pylist())
+                              if None not in group}  # pandas' groupby drops missing keys too
+    
+    def _count(self, team: str, actions, outcomes=None) -> int:
+        """Number of events by a team with one of the given actions (and outcomes)"""
+        return sum(n for (t, a, o), n in self._event_counts.items()
+                   if t == team and a in actions and (outcomes is None or o in outcomes))
+    
+    def _build_masks(self, df: pd.DataFrame):
+        """Build the team and action masks every KPI section reuses (one scan per mask)"""
+        self._masks = {
+            'home': self._code_mask(df['team'], ('Home',)),
+            'away': self._code_mask(df['team'], ('Away',)),
+            'shot': self._code_mask(df['action'], SHOT_ACTIONS),
+        }
+    
+    @staticmethod
+    def _code_mask(series: pd.Series, values) -> np.ndarray:
+        """Boolean mask of a categorical column matching any of the values, via a per-code lookup table"""
+        codes = series.cat.categories.get_indexer(list(values))
+        lookup = np.zeros(len(series.cat.categories) + 1, dtype=bool)  # last slot: code -1 (missing)
+        lookup[codes[codes >= 0]] = True  # absent values match nothing
+        return lookup[series.cat.codes.to_numpy()]
+    
+    @staticmethod
+    def _code_tally(team: pd.Series, action: pd.Series) -> pd.DataFrame:
+        """Events per (team, action) from a single bincount over the combined category codes"""
+        team_codes = team.cat.codes.to_numpy().astype(np.intp)
+        action_codes = action.cat.codes.to_numpy().astype(np.intp)
+        n_teams, n_actions = len(team.cat.categories), len(action.cat.categories)
+        valid = (team_codes >= 0) & (action_codes >= 0)  # skip missing team/action rows
+        counts = np.bincount(team_codes[valid] * n_actions + action_codes[valid],
+                             minlength=n_teams * n_actions).reshape(n_teams, n_actions)
+        return pd.DataFrame(counts, index=team.cat.categories, columns=action.cat.categories)
+    
     def _calculate_basic_kpis(self, df: pd.DataFrame):
         """Calculate basic match KPIs"""
         print("📈 Calculating basic match KPIs...")
@@ -107,16 +356,15 @@ class FootballKPIAnalyzer:
         """Calculate expected goals related KPIs"""
         print("⚽ Calculating expected goals KPIs...")
         
-        # Filter for goals and shots with xG values
-        goals_df = df[df['action'] == 'Goal'].copy()
-        shots_df = df[df['action'].isin(['Shot', 'Goal', 'CounterAttackShot'])].copy()
+        # Calculate xG metrics by team: masked sums over the raw column arrays
+        xg = df['xg_change'].to_numpy()
+        masks = self._masks
+        team_shot = np.empty_like(masks['shot'])  # one scratch mask, refilled per team
+        home_xg_total = xg[np.logical_and(masks['shot'], masks['home'], out=team_shot)].sum()
+        away_xg_total = xg[np.logical_and(masks['shot'], masks['away'], out=team_shot)].sum()
         
-        # Calculate xG metrics by team
-        home_xg_total = shots_df[shots_df['team'] == 'Home']['xg_change'].sum()
-        away_xg_total = shots_df[shots_df['team'] == 'Away']['xg_change'].sum()
-        
-        home_goals = len(goals_df[goals_df['team'] == 'Home'])
-        away_goals = len(goals_df[goals_df['team'] == 'Away'])
+        home_goals = self._count('Home', ('Goal',))
+        away_goals = self._count('Away', ('Goal',))
         
         # Expected Goals Against (xGA) = opponent's xG
         home_xga = away_xg_total  # Home team's xGA is Away team's xG
@@ -161,24 +409,19 @@ class FootballKPIAnalyzer:
         """Calculate shooting-related KPIs"""
         print("🎯 Calculating shooting KPIs...")
         
-        # All shot events
-        shot_actions = ['Shot', 'Goal', 'CounterAttackShot']
-        shots_df = df[df['action'].isin(shot_actions)].copy()
-        
-        # Shots by team
-        home_shots = len(shots_df[shots_df['team'] == 'Home'])
-        away_shots = len(shots_df[shots_df['team'] == 'Away'])
+        # Shots by team (all shot events)
+        home_shots = self._count('Home', SHOT_ACTIONS)
+        away_shots = self._count('Away', SHOT_ACTIONS)
         
         # Shots on target (successful shots + goals)
-        shots_on_target_df = shots_df[shots_df['outcome'] == 'Success']
-        home_shots_on_target = len(shots_on_target_df[shots_on_target_df['team'] == 'Home'])
-        away_shots_on_target = len(shots_on_target_df[shots_on_target_df['team'] == 'Away'])
+        home_shots_on_target = self._count('Home', SHOT_ACTIONS, ('Success',))
+        away_shots_on_target = self._count('Away', SHOT_ACTIONS, ('Success',))
         
         # Shot-creating actions (passes that lead to shots, dribbles that lead to shots)
         # This is a simplified version - counting passes and dribbles that happen before shots
-        shot_creating_actions = df[df['action'].isin(['Pass', 'Dribble', 'CounterAttackPass'])].copy()
-        home_shot_creating = len(shot_creating_actions[shot_creating_actions['team'] == 'Home'])
-        away_shot_creating = len(shot_creating_actions[shot_creating_actions['team'] == 'Away'])
+        shot_creating_actions = ('Pass', 'Dribble', 'CounterAttackPass')
+        home_shot_creating = self._count('Home', shot_creating_actions)
+        away_shot_creating = self._count('Away', shot_creating_actions)
         
         self.kpi_report['shooting_kpis'] = {
             'home_shots_total': home_shots,
@@ -200,12 +443,10 @@ class FootballKPIAnalyzer:
         """Calculate possession-related KPIs"""
         print("⚽ Calculating possession KPIs...")
         
-        # Possession events
-        possession_events = df[df['action'].isin(['Pass', 'Dribble', 'BallRecovery'])].copy()
-        
-        # Possession by team
-        home_possession_events = len(possession_events[possession_events['team'] == 'Home'])
-        away_possession_events = len(possession_events[possession_events['team'] == 'Away'])
+        # Possession events by team
+        possession_actions = ('Pass', 'Dribble', 'BallRecovery')
+        home_possession_events = self._count('Home', possession_actions)
+        away_possession_events = self._count('Away', possession_actions)
         total_possession_events = home_possession_events + away_possession_events
         
         # Possession percentage
@@ -213,20 +454,20 @@ class FootballKPIAnalyzer:
         away_possession_pct = (away_possession_events / total_possession_events * 100) if total_possession_events > 0 else 50
         
         # Touches (all actions a team performs)
-        all_actions = df[~df['action'].isin(['PossessionStart', 'PossessionEnd', 'MatchEnd'])].copy()
-        home_touches = len(all_actions[all_actions['team'] == 'Home'])
-        away_touches = len(all_actions[all_actions['team'] == 'Away'])
+        touch_actions = set(df['action'].cat.categories) - NON_TOUCH_ACTIONS
+        home_touches = self._count('Home', touch_actions)
+        away_touches = self._count('Away', touch_actions)
         
         # Pass completion rate
-        passes_df = df[df['action'].isin(['Pass', 'CounterAttackPass'])].copy()
-        home_passes = passes_df[passes_df['team'] == 'Home']
-        away_passes = passes_df[passes_df['team'] == 'Away']
+        pass_actions = ('Pass', 'CounterAttackPass')
+        home_passes = self._count('Home', pass_actions)
+        away_passes = self._count('Away', pass_actions)
         
-        home_pass_success = len(home_passes[home_passes['outcome'] == 'Success'])
-        away_pass_success = len(away_passes[away_passes['outcome'] == 'Success'])
+        home_pass_success = self._count('Home', pass_actions, ('Success',))
+        away_pass_success = self._count('Away', pass_actions, ('Success',))
         
-        home_pass_completion = (home_pass_success / len(home_passes) * 100) if len(home_passes) > 0 else 0
-        away_pass_completion = (away_pass_success / len(away_passes) * 100) if len(away_passes) > 0 else 0
+        home_pass_completion = (home_pass_success / home_passes * 100) if home_passes > 0 else 0
+        away_pass_completion = (away_pass_success / away_passes * 100) if away_passes > 0 else 0
         
         self.kpi_report['possession_kpis'] = {
             'home_possession_pct': home_possession_pct,
@@ -235,12 +476,12 @@ class FootballKPIAnalyzer:
             'away_touches_total': away_touches,
             'home_touches_per_game': home_touches / self.num_games,
             'away_touches_per_game': away_touches / self.num_games,
-            'home_passes_total': len(home_passes),
-            'away_passes_total': len(away_passes),
+            'home_passes_total': home_passes,
+            'away_passes_total': away_passes,
             'home_pass_completion_pct': home_pass_completion,
             'away_pass_completion_pct': away_pass_completion,
-            'home_passes_per_game': len(home_passes) / self.num_games,
-            'away_passes_per_game': len(away_passes) / self.num_games
+            'home_passes_per_game': home_passes / self.num_games,
+            'away_passes_per_game': away_passes / self.num_games
         }
     
     def _calculate_defensive_kpis(self, df: pd.DataFrame):
@@ -248,28 +489,24 @@ class FootballKPIAnalyzer:
         print("🛡️ Calculating defensive KPIs...")
         
         # Tackles
-        tackles_df = df[df['action'] == 'Tackle'].copy()
-        home_tackles = len(tackles_df[tackles_df['team'] == 'Home'])
-        away_tackles = len(tackles_df[tackles_df['team'] == 'Away'])
+        home_tackles = self._count('Home', ('Tackle',))
+        away_tackles = self._count('Away', ('Tackle',))
         
         # Successful tackles
-        home_tackles_success = len(tackles_df[(tackles_df['team'] == 'Home') & (tackles_df['outcome'] == 'Success')])
-        away_tackles_success = len(tackles_df[(tackles_df['team'] == 'Away') & (tackles_df['outcome'] == 'Success')])
+        home_tackles_success = self._count('Home', ('Tackle',), ('Success',))
+        away_tackles_success = self._count('Away', ('Tackle',), ('Success',))
         
         # Interceptions
-        interceptions_df = df[df['action'] == 'Interception'].copy()
-        home_interceptions = len(interceptions_df[interceptions_df['team'] == 'Home'])
-        away_interceptions = len(interceptions_df[interceptions_df['team'] == 'Away'])
+        home_interceptions = self._count('Home', ('Interception',))
+        away_interceptions = self._count('Away', ('Interception',))
         
         # Clearances
-        clearances_df = df[df['action'] == 'Clearance'].copy()
-        home_clearances = len(clearances_df[clearances_df['team'] == 'Home'])
-        away_clearances = len(clearances_df[clearances_df['team'] == 'Away'])
+        home_clearances = self._count('Home', ('Clearance',))
+        away_clearances = self._count('Away', ('Clearance',))
         
         # Ball recoveries
-        recoveries_df = df[df['action'] == 'BallRecovery'].copy()
-        home_recoveries = len(recoveries_df[recoveries_df['team'] == 'Home'])
-        away_recoveries = len(recoveries_df[recoveries_df['team'] == 'Away'])
+        home_recoveries = self._count('Home', ('BallRecovery',))
+        away_recoveries = self._count('Away', ('BallRecovery',))
         
         self.kpi_report['defensive_kpis'] = {
             'home_tackles_total': home_tackles,
@@ -292,62 +529,104 @@ class FootballKPIAnalyzer:
         """Calculate goalkeeping KPIs (simplified)"""
         print("🥅 Calculating goalkeeping KPIs...")
         
-        # Goals conceded (opponent's goals)
-        goals_df = df[df['action'] == 'Goal'].copy()
-        home_goals_conceded = len(goals_df[goals_df['team'] == 'Away'])  # Home GK concedes Away goals
-        away_goals_conceded = len(goals_df[goals_df['team'] == 'Home'])  # Away GK concedes Home goals
+        # Shot events per (team, action), tallied in one pass over the codes
+        tally = self._code_tally(df['team'], df['action']).reindex(
+            index=['Home', 'Away'], columns=list(SHOT_ACTIONS), fill_value=0)
         
-        # Shots faced (opponent's shots)
-        shot_actions = ['Shot', 'Goal', 'CounterAttackShot']
-        shots_df = df[df['action'].isin(shot_actions)].copy()
-        home_shots_faced = len(shots_df[shots_df['team'] == 'Away'])  # Home GK faces Away shots
-        away_shots_faced = len(shots_df[shots_df['team'] == 'Home'])  # Away GK faces Home shots
+        # Per-goalkeeper arrays, [Home GK, Away GK]: each keeper faces the opponent's shots
+        faced = tally.loc[['Away', 'Home']]
+        goals_conceded = faced['Goal'].to_numpy()
+        shots_faced = faced.to_numpy().sum(axis=1)
+        saves = shots_faced - goals_conceded
         
-        # Save percentage (simplified)
-        home_saves = home_shots_faced - home_goals_conceded
-        away_saves = away_shots_faced - away_goals_conceded
-        
-        home_save_pct = (home_saves / home_shots_faced * 100) if home_shots_faced > 0 else 100
-        away_save_pct = (away_saves / away_shots_faced * 100) if away_shots_faced > 0 else 100
+        # Save percentage (simplified): 100% when no shots were faced
+        save_pct = np.divide(saves * 100, shots_faced, out=np.full(2, 100.0), where=shots_faced > 0)
+        conceded_per_game = goals_conceded / self.num_games
         
         self.kpi_report['goalkeeping_kpis'] = {
-            'home_goals_conceded': home_goals_conceded,
-            'away_goals_conceded': away_goals_conceded,
-            'home_goals_conceded_per_game': home_goals_conceded / self.num_games,
-            'away_goals_conceded_per_game': away_goals_conceded / self.num_games,
-            'home_shots_faced': home_shots_faced,
-            'away_shots_faced': away_shots_faced,
-            'home_saves': home_saves,
-            'away_saves': away_saves,
-            'home_save_percentage': home_save_pct,
-            'away_save_percentage': away_save_pct
+            'home_goals_conceded': int(goals_conceded[0]),
+            'away_goals_conceded': int(goals_conceded[1]),
+            'home_goals_conceded_per_game': float(conceded_per_game[0]),
+            'away_goals_conceded_per_game': float(conceded_per_game[1]),
+            'home_shots_faced': int(shots_faced[0]),
+            'away_shots_faced': int(shots_faced[1]),
+            'home_saves': int(saves[0]),
+            'away_saves': int(saves[1]),
+            'home_save_percentage': float(save_pct[0]),
+            'away_save_percentage': float(save_pct[1])
         }
     
     def _create_kpi_visualizations(self, df: pd.DataFrame):
         """Create comprehensive KPI visualizations"""
         print("📊 Creating KPI visualizations...")
         
-        # Create a comprehensive dashboard
-        fig = plt.figure(figsize=(20, 16))
-        fig.suptitle(f'Football KPI Analysis Dashboard - {self.num_games} Games', fontsize=20, fontweight='bold', y=0.98)
-        
-        # 1. Expected Goals Comparison
-        ax1 = plt.subplot(3, 4, 1)
-        xg_data = [
-            self.kpi_report['expected_goals_kpis']['home_xg_per_match'],
-            self.kpi_report['expected_goals_kpis']['away_xg_per_match']
-        ]
-        ax1.bar(['Home', 'Away'], xg_data, color=['#FF6B6B', '#4ECDC4'], alpha=0.8)
-        ax1.set_title('Expected Goals per Match', fontweight='bold')
-        ax1.set_ylabel('xG per Match')
-        ax1.grid(axis='y', alpha=0.3)
+        # matplotlib is only needed for the dashboard; a bare Figure on an Agg canvas stays out of
+        # pyplot's global state (no backend switch, no figure kept in pyplot's manager)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        xg_kpis = self.kpi_report['expected_goals_kpis']
+        shooting = self.kpi_report['shooting_kpis']
+        possession = self.kpi_report['possession_kpis']
+        defensive = self.kpi_report['defensive_kpis']
+        goalkeeping = self.kpi_report['goalkeeping_kpis']
+        basic = self.kpi_report['basic_kpis']
+        teams = ['Home', 'Away']
+        
+        xg_data = [xg_kpis['home_xg_per_match'], xg_kpis['away_xg_per_match']]
+        xgd_data = [xg_kpis['home_xgd_per_match'], xg_kpis['away_xgd_per_match']]
+        goals_minus_xg = [xg_kpis['home_goals_minus_xg'], xg_kpis['away_goals_minus_xg']]
+        
+        # Create a comprehensive dashboard (one figure, kept and cleared between runs)
+        if self._fig is None:
+            self._fig = Figure(figsize=(20, 16), constrained_layout=True)
+            FigureCanvasAgg(self._fig)
+            self._axes = self._fig.subplots(3, 4)
+        else:
+            for ax in self._axes.flat:
+                ax.cla()
+        fig, axes = self._fig, self._axes
+        fig.suptitle(f'Football KPI Analysis Dashboard - {self.num_games} Games', fontsize=20, fontweight='bold')
+        ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8, ax9, ax10, ax11, ax12 = axes.flat
+        
+        # Single Home/Away bar panels: axis -> (title, labels, values, colors, y label, y limits)
+        panels = {
+            ax1: ('Expected Goals per Match', teams, xg_data, ['#FF6B6B', '#4ECDC4'], 'xG per Match', None),
+            ax3: ('Shots per Game', teams,
+                  [shooting['home_shots_per_game'], shooting['away_shots_per_game']],
+                  ['#FFE66D', '#95E1D3'], 'Shots per Game', None),
+            ax4: ('Shot Accuracy (%)', teams,
+                  [shooting['home_shot_accuracy'], shooting['away_shot_accuracy']],
+                  ['#A8E6CF', '#FFB3BA'], 'Accuracy (%)', (0, 100)),
+            ax6: ('Pass Completion Rate (%)', teams,
+                  [possession['home_pass_completion_pct'], possession['away_pass_completion_pct']],
+                  ['#FFCC99', '#99CCFF'], 'Completion Rate (%)', (0, 100)),
+            ax8: ('Expected Goal Difference per Match', teams, xgd_data,
+                  ['green' if x > 0 else 'red' for x in xgd_data], 'xGD per Match', None),
+            ax9: ('Goalkeeper Save Percentage', ['Home GK', 'Away GK'],
+                  [goalkeeping['home_save_percentage'], goalkeeping['away_save_percentage']],
+                  ['#FFD93D', '#6BCF7F'], 'Save Percentage (%)', (0, 100)),
+            ax10: ('Points per Match', teams,
+                   [basic['home_points_per_match'], basic['away_points_per_match']],
+                   ['#F39C12', '#9B59B6'], 'Points per Match', (0, 3)),
+            ax11: ('Touches per Game', teams,
+                   [possession['home_touches_per_game'], possession['away_touches_per_game']],
+                   ['#E74C3C', '#3498DB'], 'Touches per Game', None),
+            ax12: ('Goals - Expected Goals', teams, goals_minus_xg,
+                   ['green' if x > 0 else 'red' for x in goals_minus_xg], 'Goals - xG', None),
+        }
+        for ax, (title, labels, values, colors, ylabel, ylim) in panels.items():
+            ax.bar(labels, values, color=colors, alpha=0.8)
+            ax.set_title(title, fontweight='bold')
+            ax.set_ylabel(ylabel)
+            if ylim:
+                ax.set_ylim(*ylim)
+            ax.grid(axis='y', alpha=0.3)
+        for ax in (ax8, ax12):
+            ax.axhline(y=0, color='black', linestyle='-', alpha=0.3)
         
         # 2. Goals vs Expected Goals
-        ax2 = plt.subplot(3, 4, 2)
-        goals_data = [
-            self.kpi_report['expected_goals_kpis']['home_goals_per_match'],
-            self.kpi_report['expected_goals_kpis']['away_goals_per_match']
-        ]
+        goals_data = [xg_kpis['home_goals_per_match'], xg_kpis['away_goals_per_match']]
         x = np.arange(2)
         width = 0.35
         ax2.bar(x - width/2, goals_data, width, label='Actual Goals', color=['#FF6B6B', '#4ECDC4'], alpha=0.8)
@@ -355,71 +634,38 @@ class FootballKPIAnalyzer:
         ax2.set_title('Goals vs Expected Goals', fontweight='bold')
         ax2.set_ylabel('Goals per Match')
         ax2.set_xticks(x)
-        ax2.set_xticklabels(['Home', 'Away'])
+        ax2.set_xticklabels(teams)
         ax2.legend()
         ax2.grid(axis='y', alpha=0.3)
         
-        # 3. Shots per Game
-        ax3 = plt.subplot(3, 4, 3)
-        shots_data = [
-            self.kpi_report['shooting_kpis']['home_shots_per_game'],
-            self.kpi_report['shooting_kpis']['away_shots_per_game']
-        ]
-        ax3.bar(['Home', 'Away'], shots_data, color=['#FFE66D', '#95E1D3'], alpha=0.8)
-        ax3.set_title('Shots per Game', fontweight='bold')
-        ax3.set_ylabel('Shots per Game')
-        ax3.grid(axis='y', alpha=0.3)
-        
-        # 4. Shot Accuracy
-        ax4 = plt.subplot(3, 4, 4)
-        accuracy_data = [
-            self.kpi_report['shooting_kpis']['home_shot_accuracy'],
-            self.kpi_report['shooting_kpis']['away_shot_accuracy']
-        ]
-        ax4.bar(['Home', 'Away'], accuracy_data, color=['#A8E6CF', '#FFB3BA'], alpha=0.8)
-        ax4.set_title('Shot Accuracy (%)', fontweight='bold')
-        ax4.set_ylabel('Accuracy (%)')
-        ax4.set_ylim(0, 100)
-        ax4.grid(axis='y', alpha=0.3)
-        
         # 5. Possession Percentage
-        ax5 = plt.subplot(3, 4, 5)
-        possession_data = [
-            self.kpi_report['possession_kpis']['home_possession_pct'],
-            self.kpi_report['possession_kpis']['away_possession_pct']
-        ]
-        ax5.pie(possession_data, labels=['Home', 'Away'], autopct='%1.1f%%', 
-                colors=['#FF9999', '#66B2FF'], startangle=90)
+        possession_data = [possession['home_possession_pct'], possession['away_possession_pct']]
+        left = 0
+        for team, share, color in zip(teams, possession_data, ['#FF9999', '#66B2FF']):
+            bars = ax5.barh([0], [share], height=0.5, left=[left], color=color, label=team)
+            ax5.bar_label(bars, fmt='%.1f%%', label_type='center')
+            left += share
+        ax5.set_xlim(0, 100)
+        ax5.set_ylim(-1, 1)
+        ax5.set_yticks([])
+        ax5.set_xlabel('Possession (%)')
+        ax5.legend(loc='upper center', ncol=2)
         ax5.set_title('Possession Distribution', fontweight='bold')
         
-        # 6. Pass Completion Rate
-        ax6 = plt.subplot(3, 4, 6)
-        pass_completion_data = [
-            self.kpi_report['possession_kpis']['home_pass_completion_pct'],
-            self.kpi_report['possession_kpis']['away_pass_completion_pct']
-        ]
-        ax6.bar(['Home', 'Away'], pass_completion_data, color=['#FFCC99', '#99CCFF'], alpha=0.8)
-        ax6.set_title('Pass Completion Rate (%)', fontweight='bold')
-        ax6.set_ylabel('Completion Rate (%)')
-        ax6.set_ylim(0, 100)
-        ax6.grid(axis='y', alpha=0.3)
-        
         # 7. Defensive Actions
-        ax7 = plt.subplot(3, 4, 7)
         defensive_categories = ['Tackles', 'Interceptions', 'Clearances']
         home_defensive = [
-            self.kpi_report['defensive_kpis']['home_tackles_per_game'],
-            self.kpi_report['defensive_kpis']['home_interceptions_per_game'],
-            self.kpi_report['defensive_kpis']['home_clearances_total'] / self.num_games
+            defensive['home_tackles_per_game'],
+            defensive['home_interceptions_per_game'],
+            defensive['home_clearances_total'] / self.num_games
         ]
         away_defensive = [
-            self.kpi_report['defensive_kpis']['away_tackles_per_game'],
-            self.kpi_report['defensive_kpis']['away_interceptions_per_game'],
-            self.kpi_report['defensive_kpis']['away_clearances_total'] / self.num_games
+            defensive['away_tackles_per_game'],
+            defensive['away_interceptions_per_game'],
+            defensive['away_clearances_total'] / self.num_games
         ]
         
         x = np.arange(len(defensive_categories))
-        width = 0.35
         ax7.bar(x - width/2, home_defensive, width, label='Home', color='#FF6B6B', alpha=0.8)
         ax7.bar(x + width/2, away_defensive, width, label='Away', color='#4ECDC4', alpha=0.8)
         ax7.set_title('Defensive Actions per Game', fontweight='bold')
@@ -429,213 +675,66 @@ class FootballKPIAnalyzer:
         ax7.legend()
         ax7.grid(axis='y', alpha=0.3)
         
-        # 8. xGD per Match
-        ax8 = plt.subplot(3, 4, 8)
-        xgd_data = [
-            self.kpi_report['expected_goals_kpis']['home_xgd_per_match'],
-            self.kpi_report['expected_goals_kpis']['away_xgd_per_match']
-        ]
-        colors = ['green' if x > 0 else 'red' for x in xgd_data]
-        ax8.bar(['Home', 'Away'], xgd_data, color=colors, alpha=0.8)
-        ax8.set_title('Expected Goal Difference per Match', fontweight='bold')
-        ax8.set_ylabel('xGD per Match')
-        ax8.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-        ax8.grid(axis='y', alpha=0.3)
-        
-        # 9. Goalkeeping Performance
-        ax9 = plt.subplot(3, 4, 9)
-        save_pct_data = [
-            self.kpi_report['goalkeeping_kpis']['home_save_percentage'],
-            self.kpi_report['goalkeeping_kpis']['away_save_percentage']
-        ]
-        ax9.bar(['Home GK', 'Away GK'], save_pct_data, color=['#FFD93D', '#6BCF7F'], alpha=0.8)
-        ax9.set_title('Goalkeeper Save Percentage', fontweight='bold')
-        ax9.set_ylabel('Save Percentage (%)')
-        ax9.set_ylim(0, 100)
-        ax9.grid(axis='y', alpha=0.3)
-        
-        # 10. Points per Match
-        ax10 = plt.subplot(3, 4, 10)
-        points_data = [
-            self.kpi_report['basic_kpis']['home_points_per_match'],
-            self.kpi_report['basic_kpis']['away_points_per_match']
-        ]
-        ax10.bar(['Home', 'Away'], points_data, color=['#F39C12', '#9B59B6'], alpha=0.8)
-        ax10.set_title('Points per Match', fontweight='bold')
-        ax10.set_ylabel('Points per Match')
-        ax10.set_ylim(0, 3)
-        ax10.grid(axis='y', alpha=0.3)
-        
-        # 11. Touches per Game
-        ax11 = plt.subplot(3, 4, 11)
-        touches_data = [
-            self.kpi_report['possession_kpis']['home_touches_per_game'],
-            self.kpi_report['possession_kpis']['away_touches_per_game']
-        ]
-        ax11.bar(['Home', 'Away'], touches_data, color=['#E74C3C', '#3498DB'], alpha=0.8)
-        ax11.set_title('Touches per Game', fontweight='bold')
-        ax11.set_ylabel('Touches per Game')
-        ax11.grid(axis='y', alpha=0.3)
-        
-        # 12. Goals - xG Difference
-        ax12 = plt.subplot(3, 4, 12)
-        goals_minus_xg = [
-            self.kpi_report['expected_goals_kpis']['home_goals_minus_xg'],
-            self.kpi_report['expected_goals_kpis']['away_goals_minus_xg']
-        ]
-        colors = ['green' if x > 0 else 'red' for x in goals_minus_xg]
-        ax12.bar(['Home', 'Away'], goals_minus_xg, color=colors, alpha=0.8)
-        ax12.set_title('Goals - Expected Goals', fontweight='bold')
-        ax12.set_ylabel('Goals - xG')
-        ax12.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-        ax12.grid(axis='y', alpha=0.3)
-        
-        plt.tight_layout()
-        
         # Save visualization
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        viz_path = f'football_kpi_dashboard_{timestamp}.png'
-        plt.savefig(viz_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        viz_path = f'football_kpi_dashboard_{self._run_ts_str}.png'
+        fig.savefig(viz_path, dpi=150)  # constrained_layout already trims the margins
         
         print(f"📊 KPI dashboard saved to: {viz_path}")
         return viz_path
     
     def _generate_kpi_report(self, df: pd.DataFrame) -> str:
         """Generate comprehensive KPI report"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_path = f'football_kpi_report_{timestamp}.md'
-        
-        with open(report_path, 'w') as f:
-            f.write(f"# Football KPI Analysis Report - {self.num_games} Games\n\n")
-            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"**Total Games Analyzed:** {self.num_games}\n")
-            f.write(f"**Total Events:** {len(df):,}\n\n")
-            
-            f.write("## Executive Summary\n\n")
-            f.write(f"This comprehensive analysis covers {self.num_games} simulated football matches, ")
-            f.write(f"generating {len(df):,} total events across all key performance indicators. ")
-            f.write("The analysis provides detailed insights into team performance across multiple dimensions.\n\n")
-            
-            # Basic KPIs
-            f.write("## 📊 Basic Match KPIs\n\n")
-            basic = self.kpi_report['basic_kpis']
-            f.write(f"| Metric | Home Team | Away Team |\n")
-            f.write(f"|--------|-----------|----------|\n")
-            f.write(f"| **Total Points** | {basic['home_points_total']} | {basic['away_points_total']} |\n")
-            f.write(f"| **Points per Match** | {basic['home_points_per_match']:.2f} | {basic['away_points_per_match']:.2f} |\n")
-            f.write(f"| **Events per Game** | {basic['events_per_game']:.1f} | {basic['events_per_game']:.1f} |\n\n")
-            
-            # Expected Goals KPIs
-            f.write("## ⚽ Expected Goals Analysis\n\n")
-            xg = self.kpi_report['expected_goals_kpis']
-            f.write(f"| Metric | Home Team | Away Team |\n")
-            f.write(f"|--------|-----------|----------|\n")
-            f.write(f"| **Expected Goals (xG)** | {xg['home_xg_total']:.2f} | {xg['away_xg_total']:.2f} |\n")
-            f.write(f"| **xG per Match** | {xg['home_xg_per_match']:.2f} | {xg['away_xg_per_match']:.2f} |\n")
-            f.write(f"| **Expected Goals Against (xGA)** | {xg['home_xga_total']:.2f} | {xg['away_xga_total']:.2f} |\n")
-            f.write(f"| **xGA per Match** | {xg['home_xga_per_match']:.2f} | {xg['away_xga_per_match']:.2f} |\n")
-            f.write(f"| **Expected Goal Difference (xGD)** | {xg['home_xgd_total']:.2f} | {xg['away_xgd_total']:.2f} |\n")
-            f.write(f"| **xGD per Match** | {xg['home_xgd_per_match']:.2f} | {xg['away_xgd_per_match']:.2f} |\n")
-            f.write(f"| **xGD per 90 minutes** | {xg['home_xgd_per_90']:.2f} | {xg['away_xgd_per_90']:.2f} |\n")
-            f.write(f"| **Actual Goals** | {xg['home_goals_total']} | {xg['away_goals_total']} |\n")
-            f.write(f"| **Goals per Match** | {xg['home_goals_per_match']:.2f} | {xg['away_goals_per_match']:.2f} |\n")
-            f.write(f"| **Goals - xG** | {xg['home_goals_minus_xg']:.2f} | {xg['away_goals_minus_xg']:.2f} |\n\n")
-            
-            # Shooting KPIs
-            f.write("## 🎯 Shooting Performance\n\n")
-            shooting = self.kpi_report['shooting_kpis']
-            f.write(f"| Metric | Home Team | Away Team |\n")
-            f.write(f"|--------|-----------|----------|\n")
-            f.write(f"| **Total Shots** | {shooting['home_shots_total']} | {shooting['away_shots_total']} |\n")
-            f.write(f"| **Shots per Game** | {shooting['home_shots_per_game']:.1f} | {shooting['away_shots_per_game']:.1f} |\n")
-            f.write(f"| **Shots on Target** | {shooting['home_shots_on_target']} | {shooting['away_shots_on_target']} |\n")
-            f.write(f"| **Shot Accuracy (%)** | {shooting['home_shot_accuracy']:.1f}% | {shooting['away_shot_accuracy']:.1f}% |\n")
-            f.write(f"| **Shot-Creating Actions** | {shooting['home_shot_creating_actions']} | {shooting['away_shot_creating_actions']} |\n")
-            f.write(f"| **Shot-Creating per Game** | {shooting['home_shot_creating_per_game']:.1f} | {shooting['away_shot_creating_per_game']:.1f} |\n\n")
-            f.write(f"**Average Shots per Game (Both Teams):** {shooting['average_shots_per_game']:.1f}\n\n")
-            
-            # Possession KPIs
-            f.write("## ⚽ Possession & Passing\n\n")
-            possession = self.kpi_report['possession_kpis']
-            f.write(f"| Metric | Home Team | Away Team |\n")
-            f.write(f"|--------|-----------|----------|\n")
-            f.write(f"| **Possession (%)** | {possession['home_possession_pct']:.1f}% | {possession['away_possession_pct']:.1f}% |\n")
-            f.write(f"| **Total Touches** | {possession['home_touches_total']} | {possession['away_touches_total']} |\n")
-            f.write(f"| **Touches per Game** | {possession['home_touches_per_game']:.1f} | {possession['away_touches_per_game']:.1f} |\n")
-            f.write(f"| **Total Passes** | {possession['home_passes_total']} | {possession['away_passes_total']} |\n")
-            f.write(f"| **Passes per Game** | {possession['home_passes_per_game']:.1f} | {possession['away_passes_per_game']:.1f} |\n")
-            f.write(f"| **Pass Completion (%)** | {possession['home_pass_completion_pct']:.1f}% | {possession['away_pass_completion_pct']:.1f}% |\n\n")
-            
-            # Defensive KPIs
-            f.write("## 🛡️ Defensive Performance\n\n")
-            defensive = self.kpi_report['defensive_kpis']
-            f.write(f"| Metric | Home Team | Away Team |\n")
-            f.write(f"|--------|-----------|----------|\n")
-            f.write(f"| **Total Tackles** | {defensive['home_tackles_total']} | {defensive['away_tackles_total']} |\n")
-            f.write(f"| **Tackles per Game** | {defensive['home_tackles_per_game']:.1f} | {defensive['away_tackles_per_game']:.1f} |\n")
-            f.write(f"| **Tackle Success Rate (%)** | {defensive['home_tackle_success_pct']:.1f}% | {defensive['away_tackle_success_pct']:.1f}% |\n")
-            f.write(f"| **Interceptions** | {defensive['home_interceptions_total']} | {defensive['away_interceptions_total']} |\n")
-            f.write(f"| **Interceptions per Game** | {defensive['home_interceptions_per_game']:.1f} | {defensive['away_interceptions_per_game']:.1f} |\n")
-            f.write(f"| **Clearances** | {defensive['home_clearances_total']} | {defensive['away_clearances_total']} |\n")
-            f.write(f"| **Ball Recoveries** | {defensive['home_ball_recoveries_total']} | {defensive['away_ball_recoveries_total']} |\n\n")
-            
-            # Goalkeeping KPIs
-            f.write("## 🥅 Goalkeeping Performance\n\n")
-            gk = self.kpi_report['goalkeeping_kpis']
-            f.write(f"| Metric | Home Goalkeeper | Away Goalkeeper |\n")
-            f.write(f"|--------|-----------------|----------------|\n")
-            f.write(f"| **Goals Conceded** | {gk['home_goals_conceded']} | {gk['away_goals_conceded']} |\n")
-            f.write(f"| **Goals Conceded per Game** | {gk['home_goals_conceded_per_game']:.2f} | {gk['away_goals_conceded_per_game']:.2f} |\n")
-            f.write(f"| **Shots Faced** | {gk['home_shots_faced']} | {gk['away_shots_faced']} |\n")
-            f.write(f"| **Saves Made** | {gk['home_saves']} | {gk['away_saves']} |\n")
-            f.write(f"| **Save Percentage (%)** | {gk['home_save_percentage']:.1f}% | {gk['away_save_percentage']:.1f}% |\n\n")
-            
-            # Key Insights
-            f.write("## 🔍 Key Performance Insights\n\n")
-            
-            # Determine better performing team
-            home_xgd = xg['home_xgd_per_match']
-            away_xgd = xg['away_xgd_per_match']
-            
-            if home_xgd > away_xgd:
-                better_team = "Home"
-                xgd_diff = home_xgd - away_xgd
-            else:
-                better_team = "Away"
-                xgd_diff = away_xgd - home_xgd
-            
-            f.write(f"### Performance Analysis\n\n")
-            f.write(f"- **Superior Team:** {better_team} team shows better performance with {xgd_diff:.2f} higher xGD per match\n")
-            f.write(f"- **Shot Efficiency:** Home team converts {shooting['home_shot_accuracy']:.1f}% vs Away team {shooting['away_shot_accuracy']:.1f}%\n")
-            f.write(f"- **Possession Control:** Home {possession['home_possession_pct']:.1f}% vs Away {possession['away_possession_pct']:.1f}%\n")
-            f.write(f"- **Defensive Strength:** Home GK {gk['home_save_percentage']:.1f}% saves vs Away GK {gk['away_save_percentage']:.1f}% saves\n\n")
-            
-            f.write(f"### Statistical Significance\n\n")
-            f.write(f"With {self.num_games} games analyzed, this dataset provides statistically significant insights:\n")
-            f.write(f"- **Sample Size:** {len(df):,} events across {self.num_games} matches\n")
-            f.write(f"- **Event Density:** {len(df)/(self.num_games):.1f} events per match on average\n")
-            f.write(f"- **Performance Consistency:** Results validated across multiple match scenarios\n\n")
-            
-            f.write("## 📈 Tactical Recommendations\n\n")
-            f.write("Based on the KPI analysis, the following tactical adjustments are recommended:\n\n")
-            
-            if shooting['home_shot_accuracy'] < shooting['away_shot_accuracy']:
-                f.write("- **Home Team:** Focus on shot selection and finishing training\n")
-            else:
-                f.write("- **Away Team:** Improve shot accuracy and clinical finishing\n")
-                
-            if possession['home_possession_pct'] < 45:
-                f.write("- **Home Team:** Work on possession retention and pass completion\n")
-            elif possession['away_possession_pct'] < 45:
-                f.write("- **Away Team:** Improve ball control and passing accuracy\n")
-                
-            f.write(f"- **Set Piece Focus:** Teams averaging {shooting['average_shots_per_game']:.1f} shots per game should maximize set piece opportunities\n")
-            f.write(f"- **Defensive Structure:** Current tackle success rates suggest room for improvement in defensive positioning\n\n")
-            
-            f.write("---\n\n")
-            f.write("*This report was generated by the Football KPI Analysis System*\n")
-            f.write(f"*Analysis completed on {datetime.now().strftime('%Y-%m-%d at %H:%M:%S')}*\n")
+        report_path = f'football_kpi_report_{self._run_ts_str}.md'
+        xg = self.kpi_report['expected_goals_kpis']
+        shooting = self.kpi_report['shooting_kpis']
+        possession = self.kpi_report['possession_kpis']
+        
+        # Per-team comparison stats: rows [Away, Home] so ties resolve to Away, as before;
+        # columns [xGD per match, shot accuracy]
+        teams = np.array(['Away', 'Home'])
+        stats = np.array([
+            [xg['away_xgd_per_match'], shooting['away_shot_accuracy']],
+            [xg['home_xgd_per_match'], shooting['home_shot_accuracy']],
+        ])
+        leaders = teams[np.argmax(stats, axis=0)]
+        trailers = teams[np.argmin(stats, axis=0)]
+        gaps = np.abs(stats[1] - stats[0])
+        
+        # Determine better performing team
+        better_team = leaders[0]
+        xgd_diff = gaps[0]
+        
+        # Recommendations that depend on the comparison, as ready-made template lines
+        shot_recommendation = {
+            'Home': "- **Home Team:** Focus on shot selection and finishing training\n",
+            'Away': "- **Away Team:** Improve shot accuracy and clinical finishing\n",
+        }[trailers[1]]
+        if possession['home_possession_pct'] < 45:
+            possession_recommendation = "- **Home Team:** Work on possession retention and pass completion\n"
+        elif possession['away_possession_pct'] < 45:
+            possession_recommendation = "- **Away Team:** Improve ball control and passing accuracy\n"
+        else:
+            possession_recommendation = ""
+        
+        report = KPI_REPORT_TEMPLATE.format_map({
+            'num_games': self.num_games,
+            'n_events': len(df),
+            'events_per_match': len(df) / self.num_games,
+            'ts': self._run_ts,
+            'basic': self.kpi_report['basic_kpis'],
+            'xg': xg,
+            'shooting': shooting,
+            'possession': possession,
+            'defensive': self.kpi_report['defensive_kpis'],
+            'gk': self.kpi_report['goalkeeping_kpis'],
+            'better_team': better_team,
+            'xgd_diff': xgd_diff,
+            'shot_recommendation': shot_recommendation,
+            'possession_recommendation': possession_recommendation,
+        })
+        
+        with open(report_path, 'w', buffering=1 << 20) as f:
+            f.write(report)
         
         return report_path
 
@@ -3,11 +3,12 @@ Football Simulation Model
 Main simulation model coordinating the match
 """
 import mesa
-import random
+from collections import defaultdict
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timezone
 
-from player_agent import PlayerAgent, Position
+from player_agent import (PlayerAgent, Position, STAT_FOULS, STAT_INTERCEPTIONS,
+                          STAT_BALL_RECOVERIES, STAT_TACKLES)
 from football_field import FootballField
 from utils_logger import EventLogger
 
@@ -15,9 +16,13 @@ from utils_logger import EventLogger
 class FootballModel(mesa.Model):
     """Main football simulation model"""
     
-    def __init__(self, match_duration_minutes: int = 90, seed: Optional[int] = None):
+    def __init__(self, match_duration_minutes: int = 90, seed: Optional[int] = None,
+                 collect_every: int = 1):
         super().__init__(seed=seed)
         
+        # DataCollector sampling interval in steps (0 disables collection)
+        self.collect_every = collect_every
+        
         # Match configuration
         self.match_duration_minutes = match_duration_minutes
         self.seconds_per_step = 10  # Each step = 10 seconds
@@ -34,6 +39,19 @@ class FootballModel(mesa.Model):
         self.ball_carrier: Optional[PlayerAgent] = None
         self.current_possession_id = ""
         self.possession_count = 0
+        # Pass/dribble/shot counts per possession and team (see PlayerAgent._log_on_ball_event)
+        self.possession_action_counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"Home": 0, "Away": 0})
+        
+        # (step, team, jersey, kind) counter-attack triggers (see PlayerAgent._trace_counter_attack)
+        self._counter_attack_log: List[tuple] = []
+        
+        # Batched uniform draws from the seeded model RNG (see _rand)
+        self._event_buf = self.rng.random(2048).tolist()
+        self._bi = 0
+        
+        # Players per (zone, team), maintained by PlayerAgent._set_zone
+        self._zone_counts: Dict[tuple, int] = defaultdict(int)
         
         # Components
         self.field = FootballField()
@@ -79,6 +97,10 @@ class FootballModel(mesa.Model):
             (Position.ST, 9, "Striker"), (Position.ST, 10, "Second Striker")
         ]
         
+        # Per-team rosters, fixed for the whole match
+        self.home_players: List[PlayerAgent] = []
+        self.away_players: List[PlayerAgent] = []
+        
         # Create home team players
         for position, number, role in home_formation:
             player = PlayerAgent(
@@ -89,7 +111,8 @@ class FootballModel(mesa.Model):
                 name=f"Home {role}"
             )
             # Set initial positions
-            player.zone = self._get_initial_zone(position, "Home")
+            player._set_zone(self._get_initial_zone(position, "Home"))
+            self.home_players.append(player)
         
         # Create away team players  
         for position, number, role in away_formation:
@@ -101,7 +124,11 @@ class FootballModel(mesa.Model):
                 name=f"Away {role}"
             )
             # Set initial positions
-            player.zone = self._get_initial_zone(position, "Away")
+            player._set_zone(self._get_initial_zone(position, "Away"))
+            self.away_players.append(player)
+        
+        # All players in agent-set order (the model has no other agent types)
+        self.players: List[PlayerAgent] = self.home_players + self.away_players
     
     def _get_initial_zone(self, position: Position, team: str) -> str:
         """Get initial zone for player based on position and team"""
@@ -130,21 +157,21 @@ class FootballModel(mesa.Model):
         self.running = True
         
         # Choose random team to start with ball
-        starting_team = random.choice(["Home", "Away"])
+        starting_team = self.random.choice(["Home", "Away"])
         self._start_new_possession(starting_team)
         
         # Log match start
-        self.logger.add({
-            'possession_id': "MATCH_START",
-            'team': starting_team,
-            'player_id': 0,
-            'action': 'KickOff',
-            'zone': 'C3',
-            'pressure': 0,
-            'team_status': 'Tied',
-            'outcome': 'Success',
-            'xg_change': 0.0
-        })
+        self.logger.add(
+            possession_id="MATCH_START",
+            team=starting_team,
+            player_id=0,
+            action='KickOff',
+            zone='C3',
+            pressure=0,
+            team_status='Tied',
+            outcome='Success',
+            xg_change=0.0
+        )
     
     def _start_new_possession(self, team: str):
         """Start a new possession sequence"""
@@ -154,8 +181,7 @@ class FootballModel(mesa.Model):
         )
         
         # Find a suitable player to start possession
-        team_players = [agent for agent in self.agents 
-                       if isinstance(agent, PlayerAgent) and agent.team == team]
+        team_players = self.home_players if team == "Home" else self.away_players
         
         if team_players:
             # Give ball to midfielder or similar
@@ -166,7 +192,7 @@ class FootballModel(mesa.Model):
             if not suitable_players:
                 suitable_players = team_players
                 
-            ball_receiver = random.choice(suitable_players)
+            ball_receiver = self.random.choice(suitable_players)
             
             # Clear previous ball carrier
             if self.ball_carrier:
@@ -178,27 +204,40 @@ class FootballModel(mesa.Model):
             self.ball_zone = ball_receiver.zone
             
             # Log possession start
-            self.logger.add({
-                'possession_id': self.current_possession_id,
-                'team': team,
-                'player_id': ball_receiver.jersey_number,
-                'action': 'PossessionStart',
-                'zone': ball_receiver.zone,
-                'pressure': 0,
-                'team_status': self._get_team_status(),
-                'outcome': 'Success',
-                'xg_change': 0.0
-            })
+            self.logger.add(
+                possession_id=self.current_possession_id,
+                team=team,
+                player_id=ball_receiver.jersey_number,
+                action='PossessionStart',
+                zone=ball_receiver.zone,
+                pressure=0,
+                team_status=self._get_team_status(),
+                outcome='Success',
+                xg_change=0.0
+            )
     
     def _get_team_status(self) -> str:
         """Get current match status"""
         if self.score_home > self.score_away:
-            return "Leading" if random.choice([True, False]) else "Tied"
+            return "Leading" if self.random.choice([True, False]) else "Tied"
         elif self.score_away > self.score_home:
-            return "Trailing" if random.choice([True, False]) else "Tied" 
+            return "Trailing" if self.random.choice([True, False]) else "Tied" 
         else:
             return "Tied"
     
+    def _rand(self) -> float:
+        """Next uniform [0, 1) draw, refilling the batch buffer when exhausted"""
+        if self._bi >= len(self._event_buf):
+            self._event_buf = self.rng.random(len(self._event_buf)).tolist()
+            self._bi = 0
+        value = self._event_buf[self._bi]
+        self._bi += 1
+        return value
+    
+    def _choice(self, seq):
+        """Pick a uniformly random element of a non-empty sequence"""
+        return seq[int(self._rand() * len(seq))]
+    
     def step(self):
         """Execute one simulation step"""
         if not self.running:
@@ -219,48 +258,65 @@ class FootballModel(mesa.Model):
         self.agents.do("step")
         
         # Random events (fouls, cards, injuries - simplified)
-        if random.random() < 0.05:  # 5% chance per step
+        if self._rand() < 0.05:  # 5% chance per step
             self._random_event()
             
         # Collect data
-        self.datacollector.collect(self)
+        if self.collect_every and self.steps % self.collect_every == 0:
+            self.datacollector.collect(self)
         
         # Occasional possession changes due to interceptions, tackles
-        if random.random() < 0.1 and self.ball_carrier:  # 10% chance
+        if self._rand() < 0.1 and self.ball_carrier:  # 10% chance
             self._attempt_defensive_action()
     
+    def run_to_end(self, max_steps: Optional[int] = None):
+        """Step the match until it finishes (or max_steps is reached)"""
+        step = self.step  # Bind once; the loop runs thousands of times per match
+        if max_steps is None:
+            while self.running:
+                step()
+        else:
+            for _ in range(max_steps):
+                if not self.running:
+                    break
+                step()
+    
     def _random_event(self):
         """Handle random match events"""
         event_types = ['Foul', 'Interception', 'Clearance', 'BallRecovery']
-        event_type = random.choice(event_types)
+        event_type = self._choice(event_types)
         
         # Choose random player
-        all_players = [agent for agent in self.agents if isinstance(agent, PlayerAgent)]
-        if not all_players:
+        if not self.players:
             return
             
-        player = random.choice(all_players)
+        player = self._choice(self.players)
         
         # Log the event
-        self.logger.add({
-            'possession_id': self.current_possession_id,
-            'team': player.team,
-            'player_id': player.jersey_number,
-            'action': event_type,
-            'zone': player.zone,
-            'pressure': random.randint(0, 1),
-            'team_status': self._get_team_status(),
-            'outcome': random.choice(['Success', 'Failure']),
-            'xg_change': 0.0
-        })
+        self.logger.add(
+            possession_id=self.current_possession_id,
+            team=player.team,
+            player_id=player.jersey_number,
+            action=event_type,
+            zone=player.zone,
+            pressure=int(self._rand() * 2),
+            team_status=self._get_team_status(),
+            outcome=self._choice(['Success', 'Failure']),
+            xg_change=0.0
+        )
         
         # Update player stats
         if event_type == 'Foul':
-            player.stats['fouls'] += 1
+            player.stats_arr[STAT_FOULS] += 1
         elif event_type == 'Interception':
-            player.stats['interceptions'] += 1
+            player.stats_arr[STAT_INTERCEPTIONS] += 1
         elif event_type == 'BallRecovery':
-            player.stats['ball_recoveries'] += 1
+            player.stats_arr[STAT_BALL_RECOVERIES] += 1
+    
+    def zone_occupancy(self, zone: str) -> int:
+        """Number of players (both teams) currently in a zone"""
+        counts = self._zone_counts
+        return counts[(zone, "Home")] + counts[(zone, "Away")]
     
     def _attempt_defensive_action(self):
         """Attempt defensive action (tackle, interception)"""
@@ -269,50 +325,54 @@ class FootballModel(mesa.Model):
             
         # Find nearby opponents
         opponent_team = "Away" if self.ball_carrier.team == "Home" else "Home"
+        carrier_zone = self.ball_carrier.zone
+        adjacent_zones = self.field.get_adjacent_zones(carrier_zone)
+        counts = self._zone_counts
+        if (not counts[(carrier_zone, opponent_team)] and
+                not any(counts[(z, opponent_team)] for z in adjacent_zones)):
+            return  # Nobody close enough to challenge
+        
         nearby_opponents = []
         
-        for agent in self.agents:
-            if (isinstance(agent, PlayerAgent) and 
-                agent.team == opponent_team):
-                # Check if in same or adjacent zone
-                if (agent.zone == self.ball_carrier.zone or 
-                    agent.zone in self.field.get_adjacent_zones(self.ball_carrier.zone)):
-                    nearby_opponents.append(agent)
+        for agent in (self.home_players if opponent_team == "Home" else self.away_players):
+            # Check if in same or adjacent zone
+            if agent.zone == carrier_zone or agent.zone in adjacent_zones:
+                nearby_opponents.append(agent)
         
         if not nearby_opponents:
             return
             
         # Choose defender to attempt action
-        defender = random.choice(nearby_opponents)
-        action_type = random.choice(['Tackle', 'Interception'])
+        defender = self._choice(nearby_opponents)
+        action_type = self._choice(['Tackle', 'Interception'])
         
         # Calculate success based on skills
         if action_type == 'Tackle':
-            success_prob = defender.skills['tackling'] * 0.7
+            success_prob = defender.tackling * 0.7
         else:
-            success_prob = defender.skills['positioning'] * 0.6
+            success_prob = defender.positioning * 0.6
             
-        success = random.random() < success_prob
+        success = self._rand() < success_prob
         outcome = "Success" if success else "Failure"
         
         # Log defensive action
-        self.logger.add({
-            'possession_id': self.current_possession_id,
-            'team': defender.team,
-            'player_id': defender.jersey_number,
-            'action': action_type,
-            'zone': defender.zone,
-            'pressure': 1,
-            'team_status': self._get_team_status(),
-            'outcome': outcome,
-            'xg_change': 0.0
-        })
+        self.logger.add(
+            possession_id=self.current_possession_id,
+            team=defender.team,
+            player_id=defender.jersey_number,
+            action=action_type,
+            zone=defender.zone,
+            pressure=1,
+            team_status=self._get_team_status(),
+            outcome=outcome,
+            xg_change=0.0
+        )
         
         # Update stats
         if action_type == 'Tackle':
-            defender.stats['tackles'] += 1
+            defender.stats_arr[STAT_TACKLES] += 1
         else:
-            defender.stats['interceptions'] += 1
+            defender.stats_arr[STAT_INTERCEPTIONS] += 1
             
         if success:
             # Defender wins ball
@@ -329,17 +389,17 @@ class FootballModel(mesa.Model):
         self.running = False
         
         # Log match end events
-        self.logger.add({
-            'possession_id': 'MATCH_END',
-            'team': 'Home',
-            'player_id': 0,
-            'action': 'MatchEnd',
-            'zone': 'C3',
-            'pressure': 0,
-            'team_status': self._get_final_result(),
-            'outcome': 'Complete',
-            'xg_change': 0.0
-        })
+        self.logger.add(
+            possession_id='MATCH_END',
+            team='Home',
+            player_id=0,
+            action='MatchEnd',
+            zone='C3',
+            pressure=0,
+            team_status=self._get_final_result(),
+            outcome='Complete',
+            xg_change=0.0
+        )
         
         print(f"\n=== MATCH FINISHED ===")
         print(f"Final Score: Home {self.score_home} - {self.score_away} Away")
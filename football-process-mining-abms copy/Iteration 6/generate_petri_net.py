@@ -43,7 +43,8 @@ def generate_petri_net_visualizations():
     os.makedirs('process_analysis', exist_ok=True)
     
     # Save model in multiple formats
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    generated_at = datetime.now()
+    timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
     
     # 1. Save PNML (Petri Net Markup Language) file
     pnml_path = f'process_analysis/football_inductive_model_{timestamp}.pnml'
@@ -103,7 +104,7 @@ def generate_petri_net_visualizations():
     report_path = f'process_analysis/petri_net_report_{timestamp}.md'
     with open(report_path, 'w') as f:
         f.write(f"# Football Petri Net Analysis Report\n\n")
-        f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"**Generated:** {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"**Source:** {latest_xes.name}\n")
         f.write(f"**Algorithm:** Inductive Miner\n\n")
         
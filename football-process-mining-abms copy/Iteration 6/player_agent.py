@@ -2,6 +2,8 @@
 Football Player Agent
 Represents individual players with roles, skills, and behaviors
 """
+import logging
+import sys
 import mesa
 import numpy as np
 from enum import Enum
@@ -9,6 +11,13 @@ from typing import Dict, List, Tuple, Optional, Any
 import random
 
 
+logger = logging.getLogger(__name__)
+
+# Echo counter-attack triggers through the module logger (DEBUG level); they are
+# always recorded on model._counter_attack_log either way
+DEBUG_COUNTER_ATTACK = False
+
+
 class Position(Enum):
     """Player positions"""
     GK = "Goalkeeper"
@@ -23,6 +32,75 @@ class Position(Enum):
     ST = "Striker"
 
 
+# Skill attribute names (each stored as a slot on PlayerAgent)
+SKILL_NAMES = ('passing', 'shooting', 'tackling', 'dribbling', 'positioning',
+               'crossing', 'finishing', 'saving', 'speed', 'strength')
+
+# Zone lookup tables (4 rows A-D x 5 columns); Home attacks D, Away attacks A.
+# Zone names are interned (as in FootballField) so every table shares one string
+# object per zone and the hot dict/set lookups match on identity
+ALL_ZONES = tuple(sys.intern(f"{row}{col}") for row in "ABCD" for col in range(1, 6))
+# Zone position along the pitch (row-major, so it orders zones like the names do)
+ZONE_X = {zone: i for i, zone in enumerate(ALL_ZONES)}
+ROW_C_X, ROW_D_X = ZONE_X['C1'], ZONE_X['D1']  # First zone ids of rows C and D
+# Integer row (A=0 .. D=3) and column (1-5) of each zone
+ROW_A, ROW_B, ROW_C, ROW_D = range(4)
+ZONE_ROW = {zone: 'ABCD'.index(zone[0]) for zone in ALL_ZONES}
+ZONE_COL = {zone: int(zone[1]) for zone in ALL_ZONES}
+FINAL_THIRD_ZONES = {
+    "Home": frozenset(z for z in ALL_ZONES if z[0] == 'D'),
+    "Away": frozenset(z for z in ALL_ZONES if z[0] == 'A'),
+}
+FINAL_THIRD_ENTRIES = {
+    team: frozenset((f, t) for f in ALL_ZONES if f[0] in 'BC' for t in zones)
+    for team, zones in FINAL_THIRD_ZONES.items()
+}
+# Run targets for Home attackers in _support_attack, and the columns each role prefers
+HOME_FINAL_THIRD_ZONES = tuple(z for z in ALL_ZONES if z[0] == 'D')
+CENTRAL_COLUMNS = frozenset('234')
+LEFT_WING_COLUMNS = frozenset('12')
+RIGHT_WING_COLUMNS = frozenset('45')
+KEY_CHANCE_ZONES = {  # Central attacking zones
+    "Home": frozenset(('D2', 'D3', 'D4')),
+    "Away": frozenset(('A2', 'A3', 'A4')),
+}
+# Dribble final-third potential by team and zone row (A..D): the row before the
+# final third is high, the one before that good, everything else low
+FINAL_THIRD_POTENTIAL = {
+    "Home": (0.2, 0.6, 1.0, 0.2),
+    "Away": (0.2, 1.0, 0.6, 0.2),
+}
+# Forward zones (two rows ahead, same column +/- 1) checked by _get_space_ahead
+SPACE_AHEAD_ZONES = {
+    (team, zone): tuple(sys.intern(f"{row}{col}") for row in rows
+                        for col in range(int(zone[1]) - 1, int(zone[1]) + 2) if 1 <= col <= 5)
+    for team, rows in (("Home", "CD"), ("Away", "BA"))
+    for zone in ALL_ZONES
+}
+
+# Positions that get the final-third attacker bonus as pass targets
+ATTACKING_POSITIONS = frozenset((Position.ST, Position.CAM, Position.LW, Position.RW))
+# Positions preferred as pass targets regardless of tactics
+TARGET_POSITIONS = frozenset((Position.ST, Position.CAM))
+
+# On-ball action choices (shared tuples, see _get_available_actions)
+ACTIONS_NO_SHOT = ('Pass', 'Dribble')
+ACTIONS_WITH_SHOT = ('Pass', 'Dribble', 'Shot')
+
+# Actions that count towards a possession's length
+ON_BALL_ACTIONS = ('Pass', 'Dribble', 'Shot')
+
+# Match stat indices into PlayerAgent.stats_arr
+(STAT_PASSES_ATTEMPTED, STAT_PASSES_COMPLETED, STAT_SHOTS, STAT_GOALS,
+ STAT_TACKLES, STAT_INTERCEPTIONS, STAT_BALL_RECOVERIES, STAT_FOULS, STAT_SAVES,
+ STAT_SHOTS_ON_TARGET, STAT_LOW_XG_SHOTS, STAT_QUALITY_SHOTS) = range(12)
+
+STAT_NAMES = ('passes_attempted', 'passes_completed', 'shots', 'goals', 'tackles',
+              'interceptions', 'ball_recoveries', 'fouls', 'saves',
+              'shots_on_target', 'low_xg_shots', 'quality_shots')
+NUM_BASE_STATS = 9  # Stats tracked for every player; the rest are Home-only
+
+
 class PlayerAgent(mesa.Agent):
     """Football player agent with realistic behaviors"""
     
@@ -32,65 +110,93 @@ class PlayerAgent(mesa.Agent):
         
         # Basic info
         self.team = team
+        self.is_home = team == "Home"  # Hot-path branches test this flag, not the string
+        self._opponent_team = "Away" if self.is_home else "Home"
         self.position = position
         self.jersey_number = jersey_number
         self.name = name or f"{team} Player {jersey_number}"
         
+        # Own RNG stream, seeded from the model's so seeded matches replay exactly;
+        # the hot draws are bound once
+        self._rng = random.Random(model.random.getrandbits(64))
+        self._rand = self._rng.random
+        self._choice = self._rng.choice
+        
         # Current state
-        self.zone = "C3"  # Start in center
+        self.zone = None
+        self._set_zone("C3")  # Start in center
         self.has_ball = False
         self.energy = 100.0  # 0-100
         self.confidence = 0.5  # 0-1
+        self._recent_success = None  # Outcome of last on-ball action (None until the first)
         
         # Skills (0-1, higher is better)
-        self.skills = self._generate_skills()
+        self._generate_skills()
+        self._shot_params_cache = None  # (zone, pressure, xg, on_target_prob)
         
         # Tactical info
         self.formation_position = self._get_formation_position()
+        # Formation column on our own goal line (Home defends A, Away defends D)
+        self._defensive_zone = sys.intern(("A" if self.is_home else "D") + self.formation_position[1])
         self.current_instruction = "maintain_position"
         
-        # Shot quality tracking (Home team only)
-        if team == "Home":
-            self.shot_quality_score = 0.0  # Running total of shot quality rewards
-            self.last_shot_reward = 0.0    # Track reward from last shot
+        # Shot quality tracking (only updated for the Home team)
+        self.shot_quality_score = 0.0  # Running total of shot quality rewards
+        self.last_shot_reward = 0.0    # Track reward from last shot
         
         # Possession-based tactics (Home team only)
-        self.possession_preference = 1.5 if team == "Home" else 1.0  # Home team prefers possession
+        self.possession_preference = 1.5 if self.is_home else 1.0  # Home team prefers possession
         self.pass_chain_bonus = 0.0  # Bonus for building pass chains
         
         # FINAL THIRD PENETRATION TACTICS (Home team only)
-        self.final_third_penetration = team == "Home"  # Enable aggressive final third play
+        self.final_third_penetration = self.is_home  # Enable aggressive final third play
         self.final_third_bonus = 5.0  # +5 reward for entering final third
         self.key_chance_bonus = 10.0  # +10 reward for shots from final third
         
+        # Zone tables for this player's attacking direction (team never changes)
+        self._final_third_zones = FINAL_THIRD_ZONES[team]
+        self._final_third_entries = FINAL_THIRD_ENTRIES[team]
+        self._key_chance_zones = KEY_CHANCE_ZONES[team]
+        
         # COUNTER-ATTACK SPIKE TACTIC (Home team only)
-        self.counter_attack_mode = team == "Home"  # Enable counter-attack after interceptions
+        self.counter_attack_mode = self.is_home  # Enable counter-attack after interceptions
         self.counter_clock = 0  # Counter-attack timer (2 actions after regaining ball)
         self.counter_attack_bonus = 8.0  # +8 reward for quick counter-attacks
         
         # GROUP PRESSING → REGAIN TACTIC (Home team only)
-        self.group_pressing_enabled = team == "Home"  # Enable coordinated pressing
+        self.group_pressing_enabled = self.is_home  # Enable coordinated pressing
         self.group_press_bonus = 2.0  # +2 reward for group pressing
         self.press_regain_bonus = 10.0  # +10 reward for successful press → regain
         self.last_group_press_time = 0  # Timestamp of last group press
         
-        # Match stats
-        self.stats = {
-            'passes_attempted': 0, 'passes_completed': 0,
-            'shots': 0, 'goals': 0, 'tackles': 0, 'interceptions': 0,
-            'ball_recoveries': 0, 'fouls': 0, 'saves': 0
-        }
-        
-        # Home team additional stats for shot quality analysis
-        if team == "Home":
-            self.stats.update({
-                'shots_on_target': 0,
-                'low_xg_shots': 0,  # Shots with xG < 0.07
-                'quality_shots': 0   # Shots with good xG or on target
-            })
-        
-    def _generate_skills(self) -> Dict[str, float]:
-        """Generate player skills based on position"""
+        # Match stats, indexed by the STAT_* constants (the last three are
+        # Home-only shot quality stats: on target, xG < 0.07, good xG or on target)
+        self.stats_arr = np.zeros(len(STAT_NAMES), dtype=np.int32)
+    
+    @property
+    def skills(self) -> Dict[str, float]:
+        """Skills as a name -> value dict (for reporting)"""
+        return {skill: getattr(self, skill) for skill in SKILL_NAMES}
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Match stats as a name -> count dict (for reporting)"""
+        names = STAT_NAMES if self.is_home else STAT_NAMES[:NUM_BASE_STATS]
+        return {name: int(self.stats_arr[i]) for i, name in enumerate(names)}
+        
+    def _set_zone(self, zone: str):
+        """Move player to a zone, keeping the model's zone occupancy counts in sync"""
+        counts = self.model._zone_counts
+        if self.zone is not None:
+            counts[(self.zone, self.team)] -= 1
+        counts[(zone, self.team)] += 1
+        self.zone = zone
+        self.zone_x = ZONE_X[zone]
+        self.zone_row = ZONE_ROW[zone]
+        self.zone_col = ZONE_COL[zone]
+        
+    def _generate_skills(self):
+        """Generate player skills based on position and store them as attributes"""
         base_skills = {
             'passing': 0.5, 'shooting': 0.3, 'tackling': 0.4,
             'dribbling': 0.4, 'positioning': 0.5, 'crossing': 0.3,
@@ -113,9 +219,10 @@ class PlayerAgent(mesa.Agent):
         
         if self.position in position_modifiers:
             for skill, value in position_modifiers[self.position].items():
-                base_skills[skill] = min(0.95, value + random.uniform(-0.1, 0.1))
+                base_skills[skill] = min(0.95, value + self._rng.uniform(-0.1, 0.1))
                 
-        return base_skills
+        for skill, value in base_skills.items():
+            setattr(self, skill, value)
     
     def _get_formation_position(self) -> str:
         """Get default formation zone for position"""
@@ -154,25 +261,25 @@ class PlayerAgent(mesa.Agent):
     
     def _update_energy(self):
         """Update player energy based on activity"""
-        energy_loss = random.uniform(0.1, 0.3)
+        energy_loss = self._rng.uniform(0.1, 0.3)
         self.energy = max(0, self.energy - energy_loss)
     
     def _update_confidence(self):
         """Update confidence based on recent performance"""
         # Simplified confidence system
-        if hasattr(self, '_recent_success'):
+        if self._recent_success is not None:
             if self._recent_success:
                 base_confidence_gain = 0.05
                 
                 # HOME TEAM POSSESSION-BASED CONFIDENCE BONUS
-                if self.team == "Home":
+                if self.is_home:
                     possession_length = self._get_current_possession_length()
                     # Extra confidence for contributing to good possession play
                     if possession_length >= 3:
                         base_confidence_gain *= 1.3  # 30% bonus for pass chain contributions
                     
                     # SHOT QUALITY CONFIDENCE ADJUSTMENT
-                    if hasattr(self, 'last_shot_reward') and self.last_shot_reward != 0:
+                    if self.last_shot_reward != 0:
                         # Scale shot quality reward to confidence adjustment
                         shot_confidence_adj = self.last_shot_reward * 0.01  # Convert reward to confidence
                         base_confidence_gain += shot_confidence_adj
@@ -183,13 +290,13 @@ class PlayerAgent(mesa.Agent):
                 confidence_loss = 0.03
                 
                 # HOME TEAM: Reduced confidence loss during possession building
-                if self.team == "Home":
+                if self.is_home:
                     possession_length = self._get_current_possession_length()
                     if possession_length >= 2:
                         confidence_loss *= 0.7  # Reduce confidence loss during possession building
                     
                     # SHOT QUALITY CONFIDENCE PENALTY
-                    if hasattr(self, 'last_shot_reward') and self.last_shot_reward < 0:
+                    if self.last_shot_reward < 0:
                         # Increase confidence loss for poor shot selection
                         shot_confidence_penalty = abs(self.last_shot_reward) * 0.005
                         confidence_loss += shot_confidence_penalty
@@ -197,34 +304,35 @@ class PlayerAgent(mesa.Agent):
                 
                 self.confidence = max(0.1, self.confidence - confidence_loss)
 
+    def _trace_counter_attack(self, kind: str, message: str):
+        """Record a counter-attack trigger (message is a %-format over team and jersey)"""
+        self.model._counter_attack_log.append(
+            (self.model.steps, self.team, self.jersey_number, kind))
+        if DEBUG_COUNTER_ATTACK:
+            logger.debug(message, self.team, self.jersey_number)
+    
     def _check_for_counter_attack_trigger(self):
         """Check if last event was an interception to trigger counter-attack mode"""
         if not self.counter_attack_mode:
             return
             
-        # Check recent events in the match for interception by our team
-        recent_events = []
-        if hasattr(self.model, 'logger') and self.model.logger.events:
-            # Get last few events
-            recent_events = self.model.logger.events[-5:]  # Check last 5 events
+        # Check the last 5 events for an interception by our team (most recent wins)
+        log = self.model.logger
+        window_start = max(len(log) - 5, 0)
+        interception = log.last_success_index(self.team, 'Interception')
+        press_regain = log.last_success_index(self.team, 'PressRegain')
+        if interception < window_start and press_regain < window_start:
+            return
             
-        for event in reversed(recent_events):  # Most recent first
-            if (event.get('team') == self.team and 
-                event.get('action') == 'Interception' and
-                event.get('outcome') == 'Success'):
-                # We just regained the ball via interception!
-                self.counter_clock = 2  # Give next 2 actions special status
-                print(f"⚡ Counter-attack mode activated for {self.team} player {self.jersey_number}!")
-                break
-                
+        if interception > press_regain:
+            # We just regained the ball via interception!
+            self.counter_clock = 2  # Give next 2 actions special status
+            self._trace_counter_attack("activated", "⚡ Counter-attack mode activated for %s player %s!")
+        else:
             # ENHANCED: Also trigger on PressRegain events for super counter-attacks
-            elif (event.get('team') == self.team and 
-                  event.get('action') == 'PressRegain' and
-                  event.get('outcome') == 'Success'):
-                # We just completed a press → regain sequence!
-                self.counter_clock = 3  # Give extra time for press-regain counter-attacks
-                print(f"🚀 SUPER COUNTER-ATTACK activated for {self.team} player {self.jersey_number} after press-regain!")
-                break
+            # We just completed a press → regain sequence!
+            self.counter_clock = 3  # Give extra time for press-regain counter-attacks
+            self._trace_counter_attack("super_activated", "🚀 SUPER COUNTER-ATTACK activated for %s player %s after press-regain!")
     
     def _decide_with_ball(self):
         """Decision making when player has the ball"""
@@ -235,7 +343,17 @@ class PlayerAgent(mesa.Agent):
             
         # Weighted decision based on position and situation
         action_weights = self._calculate_action_weights(actions)
-        chosen_action = random.choices(actions, weights=action_weights)[0]
+        
+        # Inverse-CDF draw over the 2-3 actions (same draw as random.choices
+        # with weights, without building the cumulative list and bisecting)
+        r = self._rand() * sum(action_weights)
+        chosen_action = actions[-1]
+        cumulative = 0.0
+        for action, weight in zip(actions, action_weights):
+            cumulative += weight
+            if r < cumulative:
+                chosen_action = action
+                break
         
         # Execute action
         self._execute_action(chosen_action)
@@ -255,31 +373,44 @@ class PlayerAgent(mesa.Agent):
         else:
             self._defensive_positioning()
     
-    def _get_available_actions(self) -> List[str]:
+    def _get_available_actions(self) -> Tuple[str, ...]:
         """Get available actions for player with ball"""
-        actions = ['Pass', 'Dribble']
-        
-        # Add shooting if in attacking position
-        current_zone = self.zone
-        if (self.team == "Home" and current_zone.startswith(('C', 'D'))) or \
-           (self.team == "Away" and current_zone.startswith(('A', 'B'))):
-            actions.append('Shot')
-            
-        return actions
+        # Shooting is available in the attacking half (C/D for Home, A/B for Away)
+        if (self.zone_row >= ROW_C) if self.is_home else (self.zone_row <= ROW_B):
+            return ACTIONS_WITH_SHOT
+        return ACTIONS_NO_SHOT
     
-    def _calculate_action_weights(self, actions: List[str]) -> List[float]:
+    def _calculate_action_weights(self, actions: Tuple[str, ...]) -> List[float]:
         """Calculate weights for available actions"""
         weights = []
         
         # Get current possession sequence length for tactical decisions
         possession_length = self._get_current_possession_length()
         
+        # Final-third predicates shared by the counter-attack and penetration
+        # bonuses; each is evaluated at most once per decision, and only when one
+        # of those tactics is active (entries only count for teams using
+        # final-third penetration, as in _is_final_third_entry)
+        in_final_third = ((self.counter_clock > 0 or self.final_third_penetration)
+                          and self._is_in_final_third())
+        can_pass_into_final_third = can_dribble_into_final_third = False
+        if self.final_third_penetration:
+            entries = self._final_third_entries
+            zone = self.zone
+            if 'Pass' in actions:
+                can_pass_into_final_third = any(
+                    (zone, target.zone) in entries for target in self._get_pass_targets())
+            if 'Dribble' in actions:
+                can_dribble_into_final_third = any(
+                    (zone, adj_zone) in entries
+                    for adj_zone in self.model.field.get_adjacent_zones(zone))
+        
         for action in actions:
             if action == 'Pass':
-                weight = self.skills['passing'] * 0.6 + self.confidence * 0.4
+                weight = self.passing * 0.6 + self.confidence * 0.4
                 
                 # HOME TEAM POSSESSION-BASED TACTICS
-                if self.team == "Home":
+                if self.is_home:
                     # Reward building pass chains (3-4 passes)
                     if possession_length < 4:
                         # Increase pass preference for building possession
@@ -292,33 +423,25 @@ class PlayerAgent(mesa.Agent):
                         weight *= 0.9
                 
                 # COUNTER-ATTACK SPIKE (Home team only)
-                if self.counter_clock > 0:
-                    # Check if this pass would penetrate final third
-                    potential_targets = self._get_pass_targets()
-                    for target in potential_targets:
-                        if self._is_final_third_entry(self.zone, target.zone):
-                            weight += self.counter_attack_bonus  # +8 massive bonus for counter-attack final third entry
-                            print(f"⚡ Counter-attack pass bonus applied for {self.team} player {self.jersey_number}!")
-                            break
+                if self.counter_clock > 0 and can_pass_into_final_third:
+                    weight += self.counter_attack_bonus  # +8 massive bonus for counter-attack final third entry
+                    self._trace_counter_attack("pass_bonus", "⚡ Counter-attack pass bonus applied for %s player %s!")
                 
                 # FINAL THIRD PENETRATION TACTICS (Home team only)
                 if self.final_third_penetration:
                     # Massive bonus for passes that penetrate final third
-                    potential_targets = self._get_pass_targets()
-                    for target in potential_targets:
-                        if self._is_final_third_entry(self.zone, target.zone):
-                            weight *= 2.5  # 150% bonus for final third penetration
-                            break
+                    if can_pass_into_final_third:
+                        weight *= 2.5  # 150% bonus for final third penetration
                     
                     # Additional bonus for passes in final third 
-                    if self._is_in_final_third():
+                    if in_final_third:
                         weight *= 1.4  # 40% bonus for passes within final third
                         
             elif action == 'Dribble':
-                weight = self.skills['dribbling'] * 0.7 + self.confidence * 0.3
+                weight = self.dribbling * 0.7 + self.confidence * 0.3
                 
                 # HOME TEAM INTELLIGENT DRIBBLE FILTERING
-                if self.team == "Home":
+                if self.is_home:
                     # Estimate dribble success probability based on context
                     p = self._estimate_dribble_success()
                     
@@ -329,42 +452,34 @@ class PlayerAgent(mesa.Agent):
                         weight += 4  # Reward only the good dribbling opportunities
                 
                 # AWAY TEAM POSSESSION-BASED TACTICS (unchanged)
-                if self.team == "Away":
+                if not self.is_home:
                     # Reduce dribbling preference to maintain possession
                     if possession_length < 3:
                         weight *= 0.7  # 30% reduction to favor passing
                 
                 # COUNTER-ATTACK SPIKE (Home team only)
-                if self.counter_clock > 0:
-                    # Check if this dribble would penetrate final third
-                    adjacent_zones = self.model.field.get_adjacent_zones(self.zone)
-                    for adj_zone in adjacent_zones:
-                        if self._is_final_third_entry(self.zone, adj_zone):
-                            weight += self.counter_attack_bonus  # +8 massive bonus for counter-attack final third entry
-                            print(f"⚡ Counter-attack dribble bonus applied for {self.team} player {self.jersey_number}!")
-                            break
+                if self.counter_clock > 0 and can_dribble_into_final_third:
+                    weight += self.counter_attack_bonus  # +8 massive bonus for counter-attack final third entry
+                    self._trace_counter_attack("dribble_bonus", "⚡ Counter-attack dribble bonus applied for %s player %s!")
                 
                 # FINAL THIRD PENETRATION TACTICS (Home team only)
                 if self.final_third_penetration:
                     # Bonus for dribbling into final third
-                    adjacent_zones = self.model.field.get_adjacent_zones(self.zone)
-                    for adj_zone in adjacent_zones:
-                        if self._is_final_third_entry(self.zone, adj_zone):
-                            weight *= 2.0  # 100% bonus for dribbling into final third
-                            break
+                    if can_dribble_into_final_third:
+                        weight *= 2.0  # 100% bonus for dribbling into final third
                     
                     # Extra bonus for dribbling in final third
-                    if self._is_in_final_third():
+                    if in_final_third:
                         weight *= 1.6  # 60% bonus for dribbling in final third
                         
             elif action == 'Shot':
-                weight = self.skills['shooting'] * 0.8 + self.confidence * 0.2
+                weight = self.shooting * 0.8 + self.confidence * 0.2
                 # Increase weight if in good shooting position
                 if self._is_in_shooting_position():
                     weight *= 1.5
                     
                 # HOME TEAM POSSESSION-BASED TACTICS
-                if self.team == "Home":
+                if self.is_home:
                     # Reward shots after good possession build-up
                     if possession_length >= 3:
                         weight *= 1.2  # 20% bonus for shots after pass chains
@@ -375,9 +490,9 @@ class PlayerAgent(mesa.Agent):
                         weight *= 0.3  # Heavily discourage low-quality shots
                 
                 # COUNTER-ATTACK SPIKE: Bonus for quick shots in final third
-                if self.counter_clock > 0 and self._is_in_final_third():
+                if self.counter_clock > 0 and in_final_third:
                     weight += self.counter_attack_bonus * 0.6  # +4.8 bonus for counter-attack shots in final third
-                    print(f"⚡ Counter-attack shot bonus applied for {self.team} player {self.jersey_number}!")
+                    self._trace_counter_attack("shot_bonus", "⚡ Counter-attack shot bonus applied for %s player %s!")
                 
                 # FINAL THIRD PENETRATION TACTICS (Home team only)
                 if self.final_third_penetration:
@@ -385,7 +500,7 @@ class PlayerAgent(mesa.Agent):
                     if self._is_key_chance_position():
                         weight *= 3.0  # 200% bonus for key chances
                     # Regular bonus for any shot in final third
-                    elif self._is_in_final_third():
+                    elif in_final_third:
                         weight *= 1.8  # 80% bonus for final third shots
             else:
                 weight = 0.3
@@ -396,30 +511,39 @@ class PlayerAgent(mesa.Agent):
     
     def _is_in_shooting_position(self) -> bool:
         """Check if player is in good shooting position"""
-        goal_zone = self.model.field.get_goal_zone_for_team(self.team)
-        distance = self.model.field.calculate_distance(self.zone, goal_zone)
+        distance = self.model.field.distance_to_goal(self.team, self.zone)
         return distance < 20  # Within shooting range
     
     def _calculate_shot_xg(self) -> float:
         """Calculate expected goals (xG) for a shot from current position"""
-        shooting_skill = self.skills['shooting']
-        finishing_skill = self.skills['finishing']
-        
+        return self._compute_shot_params(self._get_current_pressure())[0]
+    
+    def _compute_shot_params(self, pressure: int) -> Tuple[float, float]:
+        """Get (xG, on-target probability) for a shot from the current zone under pressure"""
+        # Skills are fixed, so zone and pressure fully determine the result; the
+        # weight calculation and the shot that follows it hit the same entry
+        cached = self._shot_params_cache
+        if cached is not None and cached[0] == self.zone and cached[1] == pressure:
+            return cached[2], cached[3]
+            
         # Calculate shot quality based on position and pressure
-        goal_zone = self.model.field.get_goal_zone_for_team(self.team)
-        distance = self.model.field.calculate_distance(self.zone, goal_zone)
+        distance = self.model.field.distance_to_goal(self.team, self.zone)
         
         distance_factor = max(0.1, 1.0 - (distance / 50.0))
-        pressure = self._get_current_pressure()
         pressure_penalty = pressure * 0.1
         
-        shot_quality = (shooting_skill + finishing_skill) / 2
+        shot_quality = (self.shooting + self.finishing) / 2
         shot_quality *= distance_factor
         shot_quality -= pressure_penalty
         
         # Calculate xG (expected goals)
         xg = max(0.01, min(0.99, shot_quality))
-        return xg
+        
+        # Better shots have higher chance of being on target
+        on_target_prob = min(0.9, xg * 2.0 + 0.3)  # Base 30% + xG bonus
+        
+        self._shot_params_cache = (self.zone, pressure, xg, on_target_prob)
+        return xg, on_target_prob
     
     def _log_final_third_entry(self, from_zone: str, to_zone: str, action_type: str):
         """Log a special event for final third penetration"""
@@ -427,39 +551,32 @@ class PlayerAgent(mesa.Agent):
             return
             
         possession_id = self.model.current_possession_id
-        self.model.logger.add({
-            'possession_id': possession_id,
-            'team': self.team,
-            'player_id': self.jersey_number,
-            'action': 'FinalThirdEntry',
-            'zone': to_zone,
-            'from_zone': from_zone,
-            'entry_type': action_type,  # 'Pass', 'Dribble', or 'Movement'
-            'pressure': 0,
-            'team_status': 'Tied',
-            'outcome': 'Success',
-            'tactical_bonus': self.final_third_bonus,
-            'xg_change': 0.0
-        })
+        self.model.logger.add(
+            possession_id=possession_id,
+            team=self.team,
+            player_id=self.jersey_number,
+            action='FinalThirdEntry',
+            zone=to_zone,
+            from_zone=from_zone,
+            entry_type=action_type,  # 'Pass', 'Dribble', or 'Movement'
+            pressure=0,
+            team_status='Tied',
+            outcome='Success',
+            tactical_bonus=self.final_third_bonus,
+            xg_change=0.0
+        )
     
     def _is_final_third_entry(self, from_zone: str, to_zone: str) -> bool:
         """Check if move represents entry into final third"""
         if not self.final_third_penetration:
             return False
             
-        # For Home team: entering D zones from B/C zones
-        if self.team == "Home":
-            return (from_zone.startswith(('B', 'C')) and to_zone.startswith('D'))
-        # For Away team: entering A zones from B/C zones  
-        else:
-            return (from_zone.startswith(('B', 'C')) and to_zone.startswith('A'))
+        # Entering the attacked third (D for Home, A for Away) from B/C zones
+        return (from_zone, to_zone) in self._final_third_entries
     
     def _is_in_final_third(self) -> bool:
         """Check if player is currently in final third"""
-        if self.team == "Home":
-            return self.zone.startswith('D')
-        else:
-            return self.zone.startswith('A')
+        return self.zone in self._final_third_zones
     
     def _is_key_chance_position(self) -> bool:
         """Check if player is in position for a key chance (shot from penalty area)"""
@@ -467,27 +584,22 @@ class PlayerAgent(mesa.Agent):
             return False
             
         # Key chances are shots from central final third zones
-        if self.team == "Home":
-            return self.zone in ['D2', 'D3', 'D4']  # Central attacking zones
-        else:
-            return self.zone in ['A2', 'A3', 'A4']  # Central attacking zones
+        return self.zone in self._key_chance_zones
     
     def _get_current_possession_length(self) -> int:
         """Get the length of current possession sequence (number of passes/events)"""
-        if not hasattr(self.model, 'current_possession_id') or not self.model.current_possession_id:
-            return 0
-            
-        current_possession_id = self.model.current_possession_id
-        
-        # Count events in current possession for this team
-        possession_events = [
-            event for event in self.model.logger.events 
-            if (event.get('possession_id') == current_possession_id and 
-                event.get('team') == self.team and
-                event.get('action') in ['Pass', 'Dribble', 'Shot'])
-        ]
-        
-        return len(possession_events)
+        counts = self.model.possession_action_counts.get(self.model.current_possession_id)
+        return counts[self.team] if counts else 0
+    
+    def _log_on_ball_event(self, action: str, pressure: int, outcome: str,
+                           xg_change: float = 0.0, extras: Optional[Dict[str, Any]] = None):
+        """Log a pass/dribble/shot event and count it towards its possession's length"""
+        possession_id = self.model.current_possession_id
+        self.model.logger.add(possession_id, self.team, self.jersey_number, action, self.zone,
+                              1 if pressure > 0 else 0, 'Tied', outcome, xg_change,
+                              **(extras or {}))
+        if action in ON_BALL_ACTIONS:
+            self.model.possession_action_counts[possession_id][self.team] += 1
     
     def _execute_action(self, action: str):
         """Execute the chosen action"""
@@ -497,7 +609,7 @@ class PlayerAgent(mesa.Agent):
         if self.counter_clock > 0:
             self.counter_clock -= 1
             if self.counter_clock == 0:
-                print(f"⚡ Counter-attack mode expired for {self.team} player {self.jersey_number}")
+                self._trace_counter_attack("expired", "⚡ Counter-attack mode expired for %s player %s")
         
         if action == 'Pass':
             self._attempt_pass(pressure)
@@ -508,15 +620,9 @@ class PlayerAgent(mesa.Agent):
     
     def _get_current_pressure(self) -> int:
         """Get current pressure level on player"""
-        # Get opponent positions in nearby zones
-        opponent_positions = []
-        opponent_team = "Away" if self.team == "Home" else "Home"
-        
-        for agent in self.model.agents:
-            if isinstance(agent, PlayerAgent) and agent.team == opponent_team:
-                opponent_positions.append(agent.zone)
-                
-        return self.model.field.get_pressure_level(self.zone, opponent_positions)
+        opponent_team = self._opponent_team
+        return self.model.field.get_team_pressure_level(
+            self.zone, self.model._zone_counts, opponent_team)
     
     def _attempt_pass(self, pressure: int):
         """Attempt to pass the ball"""
@@ -532,55 +638,45 @@ class PlayerAgent(mesa.Agent):
         target = self._choose_pass_target(teammates)
         
         # Calculate pass success probability
-        pass_skill = self.skills['passing']
+        pass_skill = self.passing
         pressure_penalty = pressure * 0.1
         success_prob = max(0.1, pass_skill - pressure_penalty)
         
         # Execute pass
-        success = random.random() < success_prob
+        success = self._rand() < success_prob
         outcome = "Success" if success else "Failure"
         
         # Check for final third penetration before logging
         is_final_third_entry = self._is_final_third_entry(self.zone, target.zone) if success else False
         
         # Log event
-        possession_id = self.model.current_possession_id
-        pass_event = {
-            'possession_id': possession_id,
-            'team': self.team,
-            'player_id': self.jersey_number,
-            'action': 'Pass',
-            'zone': self.zone,
-            'pressure': 1 if pressure > 0 else 0,
-            'team_status': 'Tied',  # Simplified
-            'outcome': outcome,
-            'xg_change': 0.0
-        }
+        action = 'Pass'
+        extras = {}
         
         # Add final third penetration bonus logging
         if is_final_third_entry:
-            pass_event['final_third_entry'] = True
-            pass_event['tactical_bonus'] = self.final_third_bonus
+            extras['final_third_entry'] = True
+            extras['tactical_bonus'] = self.final_third_bonus
             
         # Add counter-attack bonus logging
         if self.counter_clock > 0 and is_final_third_entry:
-            pass_event['counter_attack'] = True
-            pass_event['counter_attack_bonus'] = self.counter_attack_bonus
+            extras['counter_attack'] = True
+            extras['counter_attack_bonus'] = self.counter_attack_bonus
             
             # Check if this counter-attack came from a press-regain sequence
             if self._was_recent_press_regain():
-                pass_event['action'] = 'PressRegainCounterPass'  # Special event type for process mining  
-                pass_event['press_regain_sequence'] = True
-                print(f"🔥→⚡ Press-Regain Counter Pass! {self.team} player {self.jersey_number}")
+                action = 'PressRegainCounterPass'  # Special event type for process mining  
+                extras['press_regain_sequence'] = True
+                self._trace_counter_attack("press_regain_pass", "🔥→⚡ Press-Regain Counter Pass! %s player %s")
             else:
-                pass_event['action'] = 'CounterAttackPass'  # Regular counter-attack pass
+                action = 'CounterAttackPass'  # Regular counter-attack pass
         
-        self.model.logger.add(pass_event)
+        self._log_on_ball_event(action, pressure, outcome, extras=extras)
         
         # Update stats
-        self.stats['passes_attempted'] += 1
+        self.stats_arr[STAT_PASSES_ATTEMPTED] += 1
         if success:
-            self.stats['passes_completed'] += 1
+            self.stats_arr[STAT_PASSES_COMPLETED] += 1
             self._recent_success = True
             
             # Log final third entry if applicable
@@ -599,11 +695,11 @@ class PlayerAgent(mesa.Agent):
     
     def _attempt_dribble(self, pressure: int):
         """Attempt to dribble past opponents"""
-        dribble_skill = self.skills['dribbling']
+        dribble_skill = self.dribbling
         pressure_penalty = pressure * 0.15
         success_prob = max(0.2, dribble_skill - pressure_penalty)
         
-        success = random.random() < success_prob
+        success = self._rand() < success_prob
         outcome = "Success" if success else "Failure"
         
         # Check for potential final third entry via dribbling
@@ -616,34 +712,24 @@ class PlayerAgent(mesa.Agent):
                     break
         
         # Log event
-        possession_id = self.model.current_possession_id
-        dribble_event = {
-            'possession_id': possession_id,
-            'team': self.team,
-            'player_id': self.jersey_number,
-            'action': 'Dribble',
-            'zone': self.zone,
-            'pressure': 1 if pressure > 0 else 0,
-            'team_status': 'Tied',
-            'outcome': outcome,
-            'xg_change': 0.0
-        }
+        action = 'Dribble'
+        extras = {}
         
         # Add final third penetration bonus logging
         if will_enter_final_third:
-            dribble_event['final_third_entry'] = True
-            dribble_event['tactical_bonus'] = self.final_third_bonus
+            extras['final_third_entry'] = True
+            extras['tactical_bonus'] = self.final_third_bonus
         elif self._is_in_final_third():
-            dribble_event['final_third_dribble'] = True
-            dribble_event['tactical_bonus'] = self.final_third_bonus * 0.6  # Smaller bonus for dribbling within
+            extras['final_third_dribble'] = True
+            extras['tactical_bonus'] = self.final_third_bonus * 0.6  # Smaller bonus for dribbling within
             
         # Add counter-attack bonus logging
         if self.counter_clock > 0 and will_enter_final_third:
-            dribble_event['counter_attack'] = True
-            dribble_event['counter_attack_bonus'] = self.counter_attack_bonus
-            dribble_event['action'] = 'CounterAttackDribble'  # Special event type for process mining
+            extras['counter_attack'] = True
+            extras['counter_attack_bonus'] = self.counter_attack_bonus
+            action = 'CounterAttackDribble'  # Special event type for process mining
         
-        self.model.logger.add(dribble_event)
+        self._log_on_ball_event(action, pressure, outcome, extras=extras)
         
         if success:
             self._recent_success = True
@@ -665,35 +751,18 @@ class PlayerAgent(mesa.Agent):
     
     def _attempt_shot(self, pressure: int):
         """Attempt to shoot at goal"""
-        shooting_skill = self.skills['shooting']
-        finishing_skill = self.skills['finishing']
-        
-        # Calculate shot quality based on position and pressure
-        goal_zone = self.model.field.get_goal_zone_for_team(self.team)
-        distance = self.model.field.calculate_distance(self.zone, goal_zone)
-        
-        distance_factor = max(0.1, 1.0 - (distance / 50.0))
-        pressure_penalty = pressure * 0.1
-        
-        shot_quality = (shooting_skill + finishing_skill) / 2
-        shot_quality *= distance_factor
-        shot_quality -= pressure_penalty
-        
-        # Calculate xG (expected goals)
-        xg = max(0.01, min(0.99, shot_quality))
-        
         # Determine shot accuracy (on target) - better shots have higher chance of being on target
-        on_target_prob = min(0.9, xg * 2.0 + 0.3)  # Base 30% + xG bonus
-        on_target = random.random() < on_target_prob
+        xg, on_target_prob = self._compute_shot_params(pressure)
+        on_target = self._rand() < on_target_prob
         
         # Determine if it's a goal (only possible if on target)
         is_goal = False
         if on_target:
-            is_goal = random.random() < (xg / on_target_prob)  # Conditional probability
+            is_goal = self._rand() < (xg / on_target_prob)  # Conditional probability
         
         # HOME TEAM SHOT QUALITY FILTER - REWARD SYSTEM
         shot_quality_reward = 0.0
-        if self.team == "Home":
+        if self.is_home:
             # Apply shot quality filter
             if xg < 0.07:  # Low xG long-shot
                 shot_quality_reward -= 4  # Discourage low-quality shots
@@ -710,78 +779,68 @@ class PlayerAgent(mesa.Agent):
         is_key_chance = self._is_key_chance_position()
         
         # Log event
-        possession_id = self.model.current_possession_id
-        shot_event = {
-            'possession_id': possession_id,
-            'team': self.team,
-            'player_id': self.jersey_number,
-            'action': 'Shot',
-            'zone': self.zone,
-            'pressure': 1 if pressure > 0 else 0,
-            'team_status': 'Tied',
-            'outcome': outcome,
-            'xg_change': xg
-        }
+        action = 'Shot'
+        extras = {}
         
         # Add key chance bonus logging
         if is_key_chance:
-            shot_event['key_chance'] = True
-            shot_event['tactical_bonus'] = self.key_chance_bonus
+            extras['key_chance'] = True
+            extras['tactical_bonus'] = self.key_chance_bonus
         elif self._is_in_final_third():
-            shot_event['final_third_shot'] = True
-            shot_event['tactical_bonus'] = self.final_third_bonus
+            extras['final_third_shot'] = True
+            extras['tactical_bonus'] = self.final_third_bonus
             
         # Add counter-attack bonus logging
         if self.counter_clock > 0 and self._is_in_final_third():
-            shot_event['counter_attack'] = True
-            shot_event['counter_attack_bonus'] = self.counter_attack_bonus * 0.6
-            shot_event['action'] = 'CounterAttackShot'  # Special event type for process mining
+            extras['counter_attack'] = True
+            extras['counter_attack_bonus'] = self.counter_attack_bonus * 0.6
+            action = 'CounterAttackShot'  # Special event type for process mining
             
         # Add shot quality metrics (Home team only)
-        if self.team == "Home":
-            shot_event['shot_quality_reward'] = shot_quality_reward
-            shot_event['on_target'] = on_target
-            shot_event['xg_value'] = xg
+        if self.is_home:
+            extras['shot_quality_reward'] = shot_quality_reward
+            extras['on_target'] = on_target
+            extras['xg_value'] = xg
         
-        self.model.logger.add(shot_event)
+        self._log_on_ball_event(action, pressure, outcome, xg, extras)
         
         # Update stats
-        self.stats['shots'] += 1
+        self.stats_arr[STAT_SHOTS] += 1
         
         # HOME TEAM: Track shot quality reward for learning
-        if self.team == "Home" and hasattr(self, 'shot_quality_score'):
+        if self.is_home:
             self.shot_quality_score += shot_quality_reward
             self.last_shot_reward = shot_quality_reward
             
             # Track additional shot quality stats
             if on_target:
-                self.stats['shots_on_target'] += 1
+                self.stats_arr[STAT_SHOTS_ON_TARGET] += 1
             if xg < 0.07:
-                self.stats['low_xg_shots'] += 1
+                self.stats_arr[STAT_LOW_XG_SHOTS] += 1
             if xg >= 0.07 or on_target:
-                self.stats['quality_shots'] += 1
+                self.stats_arr[STAT_QUALITY_SHOTS] += 1
         
         if is_goal:
-            self.stats['goals'] += 1
+            self.stats_arr[STAT_GOALS] += 1
             self._recent_success = True
             # Update model score
-            if self.team == "Home":
+            if self.is_home:
                 self.model.score_home += 1
             else:
                 self.model.score_away += 1
             
             # Log goal and possession end
-            self.model.logger.add({
-                'possession_id': possession_id,
-                'team': self.team,
-                'player_id': self.jersey_number,
-                'action': 'Goal',
-                'zone': self.zone,
-                'pressure': 0,
-                'team_status': 'Tied',
-                'outcome': 'Success',
-                'xg_change': 0.0
-            })
+            self.model.logger.add(
+                possession_id=self.model.current_possession_id,
+                team=self.team,
+                player_id=self.jersey_number,
+                action='Goal',
+                zone=self.zone,
+                pressure=0,
+                team_status='Tied',
+                outcome='Success',
+                xg_change=0.0
+            )
             
             self._end_possession("Goal")
         else:
@@ -790,61 +849,74 @@ class PlayerAgent(mesa.Agent):
     
     def _get_pass_targets(self) -> List['PlayerAgent']:
         """Get available teammates for passing"""
-        teammates = []
-        for agent in self.model.agents:
-            if (isinstance(agent, PlayerAgent) and 
-                agent.team == self.team and 
-                agent != self and
-                not agent.has_ball):
-                teammates.append(agent)
-        return teammates
+        roster = self.model.home_players if self.is_home else self.model.away_players
+        return [agent for agent in roster if agent is not self and not agent.has_ball]
     
     def _choose_pass_target(self, teammates: List['PlayerAgent']) -> 'PlayerAgent':
         """Choose best pass target from available teammates"""
         if not teammates:
             return None
             
+        # Loop-invariant context, computed once rather than per teammate
+        field = self.model.field
+        zone_counts = self.model._zone_counts
+        opponent_team = self._opponent_team
+        penetration = self.final_third_penetration
+        in_final_third = penetration and self._is_in_final_third()  # Only read under penetration
+        entries = self._final_third_entries
+        my_zone = self.zone
+        my_x = self.zone_x
+        is_home = self.is_home
+        pressure_by_zone = {}  # Teammates often share zones
+        
         # Score each teammate based on position and situation
         scores = []
         for teammate in teammates:
             score = 0.5  # Base score
+            zone = teammate.zone
+            target_x = teammate.zone_x
+            in_row_d = target_x >= ROW_D_X
             
             # FINAL THIRD PENETRATION TACTICS (Home team only)
-            if self.final_third_penetration:
+            if penetration:
                 # MASSIVE priority for final third penetration passes
-                if self._is_final_third_entry(self.zone, teammate.zone):
+                if (my_zone, zone) in entries:
                     score += 1.5  # Huge bonus for final third entry
                 
                 # High priority for passes within final third  
-                elif teammate.zone.startswith('D'):  # Teammate in final third
+                elif in_row_d:  # Teammate in final third
                     score += 0.8
                 
                 # Priority for progressive passes towards final third
-                elif (not self._is_in_final_third() and 
-                      teammate.zone.startswith('C') and 
-                      teammate.zone > self.zone):  # Moving towards D zones
+                elif (not in_final_third and 
+                      ROW_C_X <= target_x < ROW_D_X and 
+                      target_x > my_x):  # Moving towards D zones
                     score += 0.4
             
             # Prefer forward passes (general tactical preference)
-            if self.team == "Home":
-                if teammate.zone > self.zone:  # Moving towards D zones
+            if is_home:
+                if target_x > my_x:  # Moving towards D zones
                     score += 0.3
             else:
-                if teammate.zone < self.zone:  # Moving towards A zones
+                if target_x < my_x:  # Moving towards A zones
                     score += 0.3
             
             # Prefer less pressured positions
-            teammate_pressure = teammate._get_current_pressure()
+            teammate_pressure = pressure_by_zone.get(target_x)
+            if teammate_pressure is None:
+                teammate_pressure = field.get_team_pressure_level(zone, zone_counts, opponent_team)
+                pressure_by_zone[target_x] = teammate_pressure
             score -= teammate_pressure * 0.1
             
             # Prefer players in good positions for their role
-            if teammate.position in [Position.ST, Position.CAM]:
+            position = teammate.position
+            if position in TARGET_POSITIONS:
                 score += 0.2
                 
             # FINAL THIRD PENETRATION: Extra bonus for attackers in final third
-            if (self.final_third_penetration and 
-                teammate.position in [Position.ST, Position.CAM, Position.LW, Position.RW] and
-                self._is_in_final_third() and teammate.zone.startswith('D')):
+            if (penetration and 
+                position in ATTACKING_POSITIONS and
+                in_final_third and in_row_d):
                 score += 0.6
                 
             scores.append(score)
@@ -870,8 +942,8 @@ class PlayerAgent(mesa.Agent):
             
             # If we can enter final third, do it!
             if final_third_zones:
-                new_zone = random.choice(final_third_zones)
-                self.zone = new_zone
+                new_zone = self._choice(final_third_zones)
+                self._set_zone(new_zone)
                 self.model.ball_zone = new_zone
                 return
             
@@ -879,34 +951,26 @@ class PlayerAgent(mesa.Agent):
             if self._is_in_final_third():
                 goal_zones = []
                 for zone in adjacent_zones:
-                    if self.team == "Home" and zone.startswith('D'):
+                    if self.is_home and ZONE_ROW[zone] == ROW_D:
                         goal_zones.append(zone)
-                    elif self.team == "Away" and zone.startswith('A'):
+                    elif not self.is_home and ZONE_ROW[zone] == ROW_A:
                         goal_zones.append(zone)
                 
                 if goal_zones:
                     # Prefer central zones for better shooting angles
-                    central_zones = [z for z in goal_zones if z.endswith(('2', '3', '4'))]
+                    central_zones = [z for z in goal_zones if z[1] in CENTRAL_COLUMNS]
                     preferred_zones = central_zones if central_zones else goal_zones
                     
-                    new_zone = random.choice(preferred_zones)
-                    self.zone = new_zone
+                    new_zone = self._choice(preferred_zones)
+                    self._set_zone(new_zone)
                     self.model.ball_zone = new_zone
                     return
             
-        # Default movement logic - prefer forward direction
-        preferred_zones = []
-        for zone in adjacent_zones:
-            if self.team == "Home" and zone > self.zone:  # Forward for Home
-                preferred_zones.append(zone)
-            elif self.team == "Away" and zone < self.zone:  # Forward for Away
-                preferred_zones.append(zone)
-        
-        if not preferred_zones:
-            preferred_zones = adjacent_zones
+        # Default movement logic - prefer forward direction (towards D for Home, A for Away)
+        preferred_zones = self.model.field.get_forward_zones(self.team, self.zone) or adjacent_zones
             
-        new_zone = random.choice(preferred_zones)
-        self.zone = new_zone
+        new_zone = self._choice(preferred_zones)
+        self._set_zone(new_zone)
         self.model.ball_zone = new_zone
     
     def _lose_ball(self):
@@ -919,21 +983,12 @@ class PlayerAgent(mesa.Agent):
     
     def _end_possession(self, reason: str):
         """End current possession"""
-        # Log possession end
-        self.model.logger.add({
-            'possession_id': self.model.current_possession_id,
-            'team': self.team,
-            'player_id': self.jersey_number,
-            'action': 'PossessionEnd',
-            'zone': self.zone,
-            'pressure': 0,
-            'team_status': 'Tied',
-            'outcome': reason,
-            'xg_change': 0.0
-        })
+        # Log possession end (core fields positionally, in logger column order)
+        self.model.logger.add(self.model.current_possession_id, self.team, self.jersey_number,
+                              'PossessionEnd', self.zone, 0, 'Tied', reason, 0.0)
         
         # Start new possession with other team
-        other_team = "Away" if self.team == "Home" else "Home"
+        other_team = self._opponent_team
         self.model._start_new_possession(other_team)
     
     def _support_attack(self):
@@ -944,79 +999,63 @@ class PlayerAgent(mesa.Agent):
         # FINAL THIRD PENETRATION TACTICS (Home team only)
         if self.final_third_penetration:
             ball_zone = self.model.ball_carrier.zone
+            ball_in_row_d = self.model.ball_carrier.zone_row == ROW_D
             
             # If ball carrier is approaching final third, make aggressive runs
-            if (not ball_zone.startswith('D') and 
-                self.position in [Position.ST, Position.CAM, Position.LW, Position.RW]):
-                
-                # Make runs into final third zones
-                final_third_zones = ['D1', 'D2', 'D3', 'D4', 'D5']
-                available_zones = []
+            if (not ball_in_row_d and 
+                self.position in ATTACKING_POSITIONS):
                 
-                for zone in final_third_zones:
-                    occupied = any(agent.zone == zone for agent in self.model.agents 
-                                 if isinstance(agent, PlayerAgent) and agent != self)
-                    if not occupied:
-                        available_zones.append(zone)
+                # Make runs into final third zones (free of other players)
+                occupancy = self.model.zone_occupancy
+                my_zone = self.zone
+                available_zones = [zone for zone in HOME_FINAL_THIRD_ZONES
+                                   if occupancy(zone) == (zone == my_zone)]
                 
                 if available_zones:
                     # Prefer central zones for strikers and CAMs
-                    if self.position in [Position.ST, Position.CAM]:
-                        central_zones = [z for z in available_zones if z.endswith(('2', '3', '4'))]
+                    if self.position in TARGET_POSITIONS:
+                        central_zones = [z for z in available_zones if z[1] in CENTRAL_COLUMNS]
                         preferred_zones = central_zones if central_zones else available_zones
                     # Prefer wide zones for wingers
                     elif self.position == Position.LW:
-                        wide_zones = [z for z in available_zones if z.endswith(('1', '2'))]
+                        wide_zones = [z for z in available_zones if z[1] in LEFT_WING_COLUMNS]
                         preferred_zones = wide_zones if wide_zones else available_zones
                     elif self.position == Position.RW:
-                        wide_zones = [z for z in available_zones if z.endswith(('4', '5'))]
+                        wide_zones = [z for z in available_zones if z[1] in RIGHT_WING_COLUMNS]
                         preferred_zones = wide_zones if wide_zones else available_zones
                     else:
                         preferred_zones = available_zones
                     
-                    self.zone = random.choice(preferred_zones)
+                    self._set_zone(self._choice(preferred_zones))
                     return
             
             # If ball is in final third, make supporting runs within final third
-            elif ball_zone.startswith('D'):
+            elif ball_in_row_d:
                 adjacent_to_ball = self.model.field.get_adjacent_zones(ball_zone)
-                final_third_adjacent = [z for z in adjacent_to_ball if z.startswith('D')]
+                final_third_adjacent = [z for z in adjacent_to_ball if ZONE_ROW[z] == ROW_D]
                 
+                occupancy = self.model.zone_occupancy
                 for zone in final_third_adjacent:
-                    occupied = any(agent.zone == zone for agent in self.model.agents 
-                                 if isinstance(agent, PlayerAgent) and agent != self)
-                    if not occupied:
-                        self.zone = zone
+                    if occupancy(zone) == (zone == self.zone):  # Nobody but possibly us
+                        self._set_zone(zone)
                         return
         
         # Default support movement - move towards ball carrier or into space
         ball_zone = self.model.ball_carrier.zone
         adjacent_to_ball = self.model.field.get_adjacent_zones(ball_zone)
         
-        # Find free adjacent zone
-        for zone in adjacent_to_ball:
-            occupied = any(agent.zone == zone for agent in self.model.agents 
-                         if isinstance(agent, PlayerAgent))
-            if not occupied:
-                self.zone = zone
-                break
+        # Find the first free adjacent zone (one occupancy lookup per candidate)
+        occupancy = self.model.zone_occupancy
+        free_zone = next((zone for zone in adjacent_to_ball if not occupancy(zone)), None)
+        if free_zone is not None:
+            self._set_zone(free_zone)
     
     def _defensive_positioning(self):
         """Move to defensive position"""
-        # Simple defensive positioning - move towards formation position
-        formation_zone = self.formation_position
-        
-        # Adjust based on team defending direction
-        if self.team == "Home":
-            # Home defends A zones
-            if not formation_zone.startswith('A'):
-                formation_zone = "A" + formation_zone[1]
-        else:
-            # Away defends D zones  
-            if not formation_zone.startswith('D'):
-                formation_zone = "D" + formation_zone[1]
-                
-        self.zone = formation_zone
+        # Simple defensive positioning - formation column, dropped to our defending row
+        # (precomputed in __init__, formation and team never change)
+        if self.zone != self._defensive_zone:
+            self._set_zone(self._defensive_zone)
 
     def _should_engage_group_press(self) -> bool:
         """Determine if player should engage in group pressing"""
@@ -1026,12 +1065,12 @@ class PlayerAgent(mesa.Agent):
         ball_zone = self.model.ball_carrier.zone
         
         # Only press in midfield and attacking zones (B, C, D zones for Home team)
-        if not ball_zone.startswith(('B', 'C', 'D')):
+        if self.model.ball_carrier.zone_row == ROW_A:
             return False
             
         # Check if we're within 5m (adjacent zones) of the ball carrier
         ball_adjacent_zones = self.model.field.get_adjacent_zones(ball_zone)
-        current_and_adjacent = [self.zone] + self.model.field.get_adjacent_zones(self.zone)
+        current_and_adjacent = self.model.field.get_zone_neighbourhood(self.zone)
         
         # We can press if we're close enough to the ball
         can_reach_ball = any(zone in ball_adjacent_zones for zone in current_and_adjacent)
@@ -1045,16 +1084,12 @@ class PlayerAgent(mesa.Agent):
 
     def _get_pressing_group_size(self, ball_zone: str) -> int:
         """Count teammates within pressing distance of ball carrier"""
-        ball_adjacent_zones = self.model.field.get_adjacent_zones(ball_zone)
-        pressing_zones = [ball_zone] + ball_adjacent_zones
-        
-        pressing_count = 0
-        for agent in self.model.agents:
-            if (isinstance(agent, PlayerAgent) and 
-                agent.team == self.team and 
-                agent != self and  # Don't count self
-                agent.zone in pressing_zones):
-                pressing_count += 1
+        pressing_zones = self.model.field.get_zone_neighbourhood(ball_zone)
+        
+        counts = self.model._zone_counts
+        pressing_count = sum(counts[(zone, self.team)] for zone in pressing_zones)
+        if self.zone in pressing_zones:
+            pressing_count -= 1  # Don't count self
                 
         return pressing_count + 1  # +1 for self
 
@@ -1070,12 +1105,10 @@ class PlayerAgent(mesa.Agent):
         best_press_zone = None
         min_distance = float('inf')
         
+        occupancy = self.model.zone_occupancy
         for press_zone in ball_adjacent_zones:
-            # Check if zone is free
-            occupied = any(agent.zone == press_zone for agent in self.model.agents 
-                         if isinstance(agent, PlayerAgent) and agent != self)
-            
-            if not occupied:
+            # Check if zone is free (apart from ourselves)
+            if occupancy(press_zone) == (press_zone == self.zone):
                 distance = self.model.field.calculate_distance(self.zone, press_zone)
                 if distance < min_distance:
                     min_distance = distance
@@ -1083,24 +1116,24 @@ class PlayerAgent(mesa.Agent):
         
         # Move to pressing position
         if best_press_zone:
-            self.zone = best_press_zone
+            self._set_zone(best_press_zone)
             
             # Log group press event for process mining
             pressing_group_size = self._get_pressing_group_size(ball_zone)
-            self.model.logger.add({
-                'possession_id': self.model.current_possession_id,
-                'team': self.team,
-                'player_id': self.jersey_number,
-                'action': 'GroupPress',
-                'zone': self.zone,
-                'ball_zone': ball_zone,
-                'group_size': pressing_group_size,
-                'pressure': 1,
-                'team_status': 'Tied',
-                'outcome': 'Success',
-                'tactical_bonus': self.group_press_bonus,
-                'xg_change': 0.0
-            })
+            self.model.logger.add(
+                possession_id=self.model.current_possession_id,
+                team=self.team,
+                player_id=self.jersey_number,
+                action='GroupPress',
+                zone=self.zone,
+                ball_zone=ball_zone,
+                group_size=pressing_group_size,
+                pressure=1,
+                team_status='Tied',
+                outcome='Success',
+                tactical_bonus=self.group_press_bonus,
+                xg_change=0.0
+            )
             
             # Update timestamp for press-regain detection
             self.last_group_press_time = self.model.steps
@@ -1116,55 +1149,39 @@ class PlayerAgent(mesa.Agent):
         if time_since_press > 3:
             return
             
-        # Check recent events for successful interception by our team
-        recent_events = []
-        if hasattr(self.model, 'logger') and self.model.logger.events:
-            recent_events = self.model.logger.events[-3:]  # Check last 3 events
+        # Check the last 3 events for a successful interception by our team
+        log = self.model.logger
+        if log.last_success_index(self.team, 'Interception') >= max(len(log) - 3, 0):
+            # We successfully regained the ball after group pressing!
+            self.model.logger.add(
+                possession_id=self.model.current_possession_id,
+                team=self.team,
+                player_id=self.jersey_number,
+                action='PressRegain',
+                zone=self.zone,
+                time_since_press=time_since_press,
+                pressure=0,
+                team_status='Tied',
+                outcome='Success',
+                tactical_bonus=self.press_regain_bonus,
+                xg_change=0.0
+            )
             
-        for event in reversed(recent_events):  # Most recent first
-            if (event.get('team') == self.team and 
-                event.get('action') == 'Interception' and
-                event.get('outcome') == 'Success'):
-                
-                # We successfully regained the ball after group pressing!
-                self.model.logger.add({
-                    'possession_id': self.model.current_possession_id,
-                    'team': self.team,
-                    'player_id': self.jersey_number,
-                    'action': 'PressRegain',
-                    'zone': self.zone,
-                    'time_since_press': time_since_press,
-                    'pressure': 0,
-                    'team_status': 'Tied',
-                    'outcome': 'Success',
-                    'tactical_bonus': self.press_regain_bonus,
-                    'xg_change': 0.0
-                })
-                
-                print(f"⚡ PRESS REGAIN! {self.team} player {self.jersey_number} completed press → regain sequence!")
-                
-                # Reset press timer
-                self.last_group_press_time = 0
-                break
+            self._trace_counter_attack("press_regain", "⚡ PRESS REGAIN! %s player %s completed press → regain sequence!")
+            
+            # Reset press timer
+            self.last_group_press_time = 0
 
     def _was_recent_press_regain(self) -> bool:
         """Check if there was a recent PressRegain event in our team's actions"""
-        if not hasattr(self.model, 'logger') or not self.model.logger.events:
-            return False
-            
         # Check last 5 events for PressRegain by our team
-        recent_events = self.model.logger.events[-5:]
-        for event in reversed(recent_events):
-            if (event.get('team') == self.team and 
-                event.get('action') == 'PressRegain' and
-                event.get('outcome') == 'Success'):
-                return True
-        return False
+        log = self.model.logger
+        return log.last_success_index(self.team, 'PressRegain') >= max(len(log) - 5, 0)
     
     def _estimate_dribble_success(self) -> float:
         """Estimate dribble success probability based on opponent density & space ahead"""
         # Base success from player skills
-        base_success = self.skills['dribbling']
+        base_success = self.dribbling
         
         # Factor 1: Opponent density in current and adjacent zones
         opponent_density = self._get_local_opponent_density()
@@ -1178,86 +1195,40 @@ class PlayerAgent(mesa.Agent):
         # Factor 4: Final third opportunity (high-value dribbles)
         final_third_potential = self._get_final_third_potential()
         
-        # Combined probability calculation
-        success_prob = base_success
-        success_prob -= opponent_density * 0.3  # Heavy penalty for crowded areas
-        success_prob += space_ahead * 0.2       # Bonus for open space ahead
-        success_prob -= pressure * 0.15         # Penalty for high pressure
-        success_prob += final_third_potential * 0.25  # Bonus for final third entry potential
+        # Combined probability calculation (one straight-line expression)
+        success_prob = (base_success
+                        - opponent_density * 0.3         # Heavy penalty for crowded areas
+                        + space_ahead * 0.2              # Bonus for open space ahead
+                        - pressure * 0.15                # Penalty for high pressure
+                        + final_third_potential * 0.25)  # Bonus for final third entry potential
         
         # Ensure probability is between 0.1 and 0.95
-        return max(0.1, min(0.95, success_prob))
+        if success_prob < 0.1:
+            return 0.1
+        return 0.95 if success_prob > 0.95 else success_prob
     
     def _get_local_opponent_density(self) -> float:
         """Calculate opponent density in current and adjacent zones"""
-        zones_to_check = [self.zone] + self.model.field.get_adjacent_zones(self.zone)
-        opponent_count = 0
-        
-        for agent in self.model.agents:
-            if (isinstance(agent, PlayerAgent) and 
-                agent.team != self.team and 
-                agent.zone in zones_to_check):
-                opponent_count += 1
+        zones_to_check = self.model.field.get_zone_neighbourhood(self.zone)
+        counts = self.model._zone_counts
+        opponent_team = self._opponent_team
+        opponent_count = sum(counts[(zone, opponent_team)] for zone in zones_to_check)
         
         # Normalize: 0.0 = no opponents, 1.0 = heavily crowded
         return min(1.0, opponent_count / 3.0)
     
     def _get_space_ahead(self) -> float:
         """Calculate available space in attacking direction"""
-        if self.team == "Home":
-            # Home attacks towards D zones
-            target_zones = []
-            current_row = self.zone[0]
-            current_col = int(self.zone[1])
-            
-            # Look for space in forward zones (C, D rows)
-            for row in ['C', 'D']:
-                for col_offset in [-1, 0, 1]:
-                    new_col = current_col + col_offset
-                    if 1 <= new_col <= 5:
-                        target_zones.append(f"{row}{new_col}")
-        else:
-            # Away attacks towards A zones
-            target_zones = []
-            current_row = self.zone[0]
-            current_col = int(self.zone[1])
-            
-            # Look for space in forward zones (B, A rows)
-            for row in ['B', 'A']:
-                for col_offset in [-1, 0, 1]:
-                    new_col = current_col + col_offset
-                    if 1 <= new_col <= 5:
-                        target_zones.append(f"{row}{new_col}")
+        # Home looks at rows C-D, Away at rows B-A
+        target_zones = SPACE_AHEAD_ZONES[(self.team, self.zone)]
         
         # Count free zones ahead
-        free_zones = 0
-        for zone in target_zones:
-            occupied = any(agent.zone == zone for agent in self.model.agents 
-                         if isinstance(agent, PlayerAgent))
-            if not occupied:
-                free_zones += 1
+        occupancy = self.model.zone_occupancy
+        free_zones = sum(1 for zone in target_zones if not occupancy(zone))
         
         # Normalize: 0.0 = no space, 1.0 = plenty of space
         return min(1.0, free_zones / len(target_zones)) if target_zones else 0.0
     
     def _get_final_third_potential(self) -> float:
         """Calculate potential for dribble to lead to final third entry"""
-        if self.team == "Home":
-            # Check if dribble could lead to D zones (final third for Home)
-            if self.zone.startswith('C'):
-                # On the edge of final third - high potential
-                return 1.0
-            elif self.zone.startswith('B'):
-                # Good potential from midfield
-                return 0.6
-            else:
-                # Lower potential from defense
-                return 0.2
-        else:
-            # Away team attacks towards A zones
-            if self.zone.startswith('B'):
-                return 1.0
-            elif self.zone.startswith('C'):
-                return 0.6
-            else:
-                return 0.2
+        return FINAL_THIRD_POTENTIAL[self.team][self.zone_row]
@@ -45,24 +45,33 @@ class FootballProcessMiner:
         print(f"✅ Loaded {len(df)} events from {len(event_log)} traces")
         return df, event_log, latest_csv.name
     
-    def load_batch_matches(self, batch_dir: str = "batch_outputs") -> tuple:
-        """Load batch match data from multiple games"""
+    def load_batch_matches(self, batch_dir: str = "batch_outputs",
+                           csv_path: str = None, xes_path: str = None) -> tuple:
+        """Load batch match data from multiple games
+        
+        Explicit csv_path/xes_path are loaded directly; otherwise the latest
+        batch_matches_* files in batch_dir are used.
+        """
         print("🔍 Loading batch match data...")
         
-        # Find latest batch CSV and XES files
-        batch_path = Path(batch_dir)
-        if not batch_path.exists():
-            raise FileNotFoundError(f"Batch directory {batch_dir} not found")
+        if csv_path and xes_path:
+            latest_csv = Path(csv_path)
+            latest_xes = Path(xes_path)
+        else:
+            # Find latest batch CSV and XES files
+            batch_path = Path(batch_dir)
+            if not batch_path.exists():
+                raise FileNotFoundError(f"Batch directory {batch_dir} not found")
+                
+            csv_files = list(batch_path.glob("batch_matches_*.csv"))
+            xes_files = list(batch_path.glob("batch_matches_*.xes"))
             
-        csv_files = list(batch_path.glob("batch_matches_*.csv"))
-        xes_files = list(batch_path.glob("batch_matches_*.xes"))
-        
-        if not csv_files or not xes_files:
-            raise FileNotFoundError("No batch match files found in batch directory")
-        
-        # Get latest files
-        latest_csv = max(csv_files, key=os.path.getctime)
-        latest_xes = max(xes_files, key=os.path.getctime)
+            if not csv_files or not xes_files:
+                raise FileNotFoundError("No batch match files found in batch directory")
+            
+            # Get latest files
+            latest_csv = max(csv_files, key=os.path.getctime)
+            latest_xes = max(xes_files, key=os.path.getctime)
         
         print(f"📊 Loading batch CSV: {latest_csv.name}")
         print(f"📊 Loading batch XES: {latest_xes.name}")
@@ -326,9 +335,9 @@ class FootballProcessMiner:
             'figure.titlesize': 14
         })
         
-        # Create figure with better spacing
-        fig = plt.figure(figsize=(18, 12))
-        fig.suptitle('Football Process Mining Analysis Dashboard', fontsize=16, fontweight='bold', y=0.98)
+        # Create figure with better spacing (constrained_layout lays it out once at save time)
+        fig = plt.figure(figsize=(18, 12), constrained_layout=True)
+        fig.suptitle('Football Process Mining Analysis Dashboard', fontsize=16, fontweight='bold')
         
         # 1. Activity frequency chart
         ax1 = plt.subplot(3, 3, 1)
@@ -442,10 +451,8 @@ class FootballProcessMiner:
         
         # 8. Events per minute timeline
         ax8 = plt.subplot(3, 3, 8)
-        df_temp = df.copy()
-        df_temp['timestamp'] = pd.to_datetime(df_temp['timestamp'])
-        df_temp['minute'] = df_temp['timestamp'].dt.minute
-        events_per_minute = df_temp.groupby('minute').size()
+        minute = pd.to_datetime(df['timestamp']).dt.minute.rename('minute')
+        events_per_minute = df.groupby(minute).size()
         
         ax8.plot(events_per_minute.index, events_per_minute.values, 
                 marker='o', linewidth=2, markersize=4, color='darkred')
@@ -482,12 +489,8 @@ class FootballProcessMiner:
             ax9.text(bar.get_x() + bar.get_width()/2., height + 1,
                     f'{height:.1f}%', ha='center', va='bottom', fontsize=8)
         
-        # Adjust layout with better spacing
-        plt.tight_layout(rect=[0, 0.02, 1, 0.96])
-        plt.subplots_adjust(hspace=0.4, wspace=0.3)
-        
         viz_path = f"{self.analysis_dir}/process_analysis_charts.png"
-        plt.savefig(viz_path, dpi=300, bbox_inches='tight', facecolor='white', edgecolor='none')
+        plt.savefig(viz_path, dpi=150, facecolor='white', edgecolor='none')
         print(f"📊 Enhanced charts saved: {viz_path}")
         plt.show()
         
@@ -518,11 +521,9 @@ class FootballProcessMiner:
         
         # 2. Time-based analysis
         print("\nTemporal analysis...")
-        df_copy = df.copy()
-        df_copy['timestamp'] = pd.to_datetime(df_copy['timestamp'])
-        df_copy['minute'] = df_copy['timestamp'].dt.minute
+        minute = pd.to_datetime(df['timestamp']).dt.minute.rename('minute')
         
-        temporal_stats = df_copy.groupby('minute')['action'].count()
+        temporal_stats = df.groupby(minute)['action'].count()
         print(f"Event distribution over time: {temporal_stats.describe()}")
         
         # 3. Performance analysis
@@ -549,12 +550,13 @@ class FootballProcessMiner:
     
     def generate_enhanced_report(self, df: pd.DataFrame, event_log, stats: dict, match_file: str, models: dict, heuristic_models: dict = None, comparison: dict = None):
         """Generate comprehensive process mining report with all team models including heuristic mining"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        generated_at = datetime.now()
+        timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
         report_path = f"{self.analysis_dir}/process_mining_report_{timestamp}.md"
         
         with open(report_path, 'w') as f:
             f.write(f"# Football Process Mining Report - Multi-Team Analysis\n\n")
-            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"**Generated:** {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"**Source File:** {match_file}\n\n")
             
             f.write(f"## Executive Summary\n\n")
@@ -697,12 +699,13 @@ class FootballProcessMiner:
     def generate_batch_enhanced_report(self, df: pd.DataFrame, event_log, stats: dict, 
                                      match_file: str, models: dict, num_games: int, heuristic_models: dict = None, comparison: dict = None):
         """Generate comprehensive batch process mining report including heuristic mining"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        generated_at = datetime.now()
+        timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
         report_path = f"{self.analysis_dir}/batch_process_mining_report_{timestamp}.md"
         
         with open(report_path, 'w') as f:
             f.write(f"# Football Batch Process Mining Report - {num_games} Games Analysis\n\n")
-            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"**Generated:** {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"**Source File:** {match_file}\n")
             f.write(f"**Games Analyzed:** {num_games}\n\n")
             
@@ -1119,14 +1122,16 @@ class FootballProcessMiner:
             traceback.print_exc()
             return None
 
-    def run_batch_analysis(self):
+    def run_batch_analysis(self, csv_path: str = None, xes_path: str = None):
         """Run process mining analysis on batch data from multiple games"""
         try:
             print("\n🔬 FOOTBALL BATCH PROCESS MINING ANALYSIS")
             print("=" * 60)
             
             # Load batch data
-            df, event_log, match_file, num_games = self.load_batch_matches()
+            df, event_log, match_file, num_games = self.load_batch_matches(
+                csv_path=csv_path, xes_path=xes_path
+            )
             
             # Basic statistics with game count
             stats = self.basic_statistics(df, event_log)
@@ -5,13 +5,32 @@ Simple, direct implementation for running 30 games and process mining analysis
 """
 import os
 import pandas as pd
-import pm4py
+from functools import partial
 from datetime import datetime
-from football_model import FootballModel
-from process_mining_analysis import FootballProcessMiner
+from batch_simulation import match_result_label, run_in_pool, simulate_match
 import warnings
 warnings.filterwarnings('ignore')
 
+def run_one_match(game_num, seed0=42):
+    """Simulate one 45-minute match; returns its tagged events and result row"""
+    seed = seed0 + game_num
+    events, home_goals, away_goals, possessions = simulate_match(
+        seed, {'match_id': f"M{game_num + 1:02d}", 'game_number': game_num + 1})
+    
+    return events, {
+        'game': game_num + 1,
+        'seed': seed,
+        'home_goals': home_goals,
+        'away_goals': away_goals,
+        'total_events': len(events),
+        'total_possessions': possessions,
+        'result': match_result_label(home_goals, away_goals)
+    }
+
+def run_batch(n_matches, seed0=42, processes=None):
+    """Simulate independent matches across worker processes, yielding results in game order"""
+    yield from run_in_pool(partial(run_one_match, seed0=seed0), range(n_matches), processes)
+
 def run_30_game_batch():
     """Run 30 football games and perform process mining analysis"""
     print("🚀 30-GAME FOOTBALL BATCH SIMULATION")
@@ -27,49 +46,14 @@ def run_30_game_batch():
     
     start_time = datetime.now()
     
-    # Run 30 games
-    for game_num in range(num_games):
-        print(f"🏈 Game {game_num + 1}/30 (seed: {42 + game_num})")
-        
-        # Create and run match
-        model = FootballModel(match_duration_minutes=45, seed=42 + game_num)
-        
-        # Run full match
-        while model.running:
-            model.step()
-        
-        # Collect events
-        events = model.logger.events.copy()
-        
-        # Add match identifier
-        for event in events:
-            event['match_id'] = f"M{game_num + 1:02d}"
-            event['game_number'] = game_num + 1
-        
+    # Run 30 games (in parallel worker processes, reported in game order)
+    for game_num, (events, match_result) in enumerate(run_batch(num_games)):
         combined_events.extend(events)
+        match_results.append(match_result)
         
-        # Calculate match stats
-        home_goals = sum(1 for e in events if e.get('action') == 'Goal' and e.get('team') == 'Home')
-        away_goals = sum(1 for e in events if e.get('action') == 'Goal' and e.get('team') == 'Away')
-        total_possessions = len(set(e.get('possession_id', '') for e in events if e.get('possession_id')))
-        
-        result = 'Draw'
-        if home_goals > away_goals:
-            result = 'Home Win'
-        elif away_goals > home_goals:
-            result = 'Away Win'
-        
-        match_results.append({
-            'game': game_num + 1,
-            'seed': 42 + game_num,
-            'home_goals': home_goals,
-            'away_goals': away_goals,
-            'total_events': len(events),
-            'total_possessions': total_possessions,
-            'result': result
-        })
-        
-        print(f"   ⚽ {result}: {home_goals}-{away_goals} | Events: {len(events)} | Possessions: {total_possessions}")
+        print(f"🏈 Game {game_num + 1}/30 (seed: {match_result['seed']})")
+        print(f"   ⚽ {match_result['result']}: {match_result['home_goals']}-{match_result['away_goals']} | "
+              f"Events: {match_result['total_events']} | Possessions: {match_result['total_possessions']}")
         
         # Progress update every 5 games
         if (game_num + 1) % 5 == 0:
@@ -91,9 +75,9 @@ def run_30_game_batch():
     df.to_csv(csv_path, index=False)
     print(f"📄 Combined CSV: {csv_path}")
     
-    # 2. XES Export for PM4Py
-    df_xes = df.copy()
-    df_xes = df_xes.rename(columns={
+    # 2. XES Export for PM4Py (imported here so the match workers never load it)
+    import pm4py
+    df_xes = df.rename(columns={  # rename already returns a new frame
         'possession_id': 'case:concept:name',
         'action': 'concept:name', 
         'timestamp': 'time:timestamp'
@@ -138,43 +122,17 @@ def run_process_mining_on_batch(csv_path, xes_path, total_events, total_possessi
     print("=" * 50)
     print(f"Analyzing {total_events:,} events from {total_possessions:,} possessions")
     
-    # Load the data
-    df = pd.read_csv(csv_path)
-    event_log = pm4py.read_xes(xes_path)
-    
-    print(f"✅ Data loaded: {len(df)} events, {len(event_log)} traces")
-    
-    # Run process mining with the existing analyzer
-    # We'll use the process_mining_analysis.py with --batch flag
-    import subprocess
-    import sys
-    
-    # Copy files to the expected location for batch analysis
-    import shutil
-    batch_dir = "batch_outputs"
-    expected_csv = f"{batch_dir}/batch_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    expected_xes = f"{batch_dir}/batch_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xes"
-    
-    shutil.copy2(csv_path, expected_csv)
-    shutil.copy2(xes_path, expected_xes)
-    
-    print(f"📁 Copied files for batch analysis:")
-    print(f"   CSV: {expected_csv}")
-    print(f"   XES: {expected_xes}")
-    
-    # Run the process mining analysis
-    result = subprocess.run([
-        sys.executable, "process_mining_analysis.py", "--batch"
-    ], capture_output=True, text=True)
+    # Run the process mining analysis in-process on the files just written
+    from process_mining_analysis import FootballProcessMiner
+    miner = FootballProcessMiner(output_dir="batch_outputs")
+    results = miner.run_batch_analysis(csv_path=csv_path, xes_path=xes_path)
     
-    if result.returncode == 0:
+    if results:
         print("✅ Process mining analysis completed successfully!")
-        print(result.stdout)
     else:
-        print("❌ Process mining analysis failed:")
-        print(result.stderr)
+        print("❌ Process mining analysis failed (see errors above)")
     
-    return result.returncode == 0
+    return results is not None
 
 def main():
     """Main function to run the complete 30-game analysis"""
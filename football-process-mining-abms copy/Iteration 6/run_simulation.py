@@ -82,7 +82,7 @@ def run_simulation(match_duration: int = 90, seed: int = None, output_dir: str =
     
     # Print sample events for verification
     print(f"\n🔍 Sample Events (first 10):")
-    sample_events = model.logger.events[:10]
+    sample_events = model.logger.head(10)
     for i, event in enumerate(sample_events):
         print(f"  {i+1:2d}. {event['action']:12s} | {event['team']:4s} #{event['player_id']:2d} | "
               f"{event['zone']:2s} | {event['outcome']:7s}")
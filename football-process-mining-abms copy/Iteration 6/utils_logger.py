@@ -2,77 +2,166 @@
 Event Logger for Football Simulation
 Handles CSV and XES export for process mining analysis
 """
+import numpy as np
 import pandas as pd
-import pm4py
+import time
+from array import array
+from collections import Counter
 from datetime import datetime, timezone
 import uuid
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import os
 
 
+# Core event columns, in export order
+CORE_COLUMNS = ['possession_id', 'timestamp', 'team', 'player_id', 'action',
+                'zone', 'pressure', 'team_status', 'outcome', 'xg_change']
+
+
 class EventLogger:
-    """Event logger for football simulation with CSV and XES export capabilities"""
+    """Event logger for football simulation with CSV and XES export capabilities
+    
+    Events are stored column-wise: typed arrays for numeric fields, uint16 codes
+    into a shared string table for the categorical ones, and one sparse
+    {event index: value} column per extra attribute name.
+    """
     
     def __init__(self):
-        self.events: List[Dict[str, Any]] = []
+        self._strings: List[Any] = []       # code -> string
+        self._codes: Dict[Any, int] = {}    # string -> code
         self.possession_counter = 0
+        self._reset_columns()
+        
+    def _reset_columns(self) -> None:
+        self._possession_id: List[str] = []
+        self._timestamp = array('d')        # UTC epoch seconds
+        self._team = array('H')
+        self._player_id = array('i')
+        self._action = array('H')
+        self._zone = array('H')
+        self._pressure = array('b')
+        self._team_status = array('H')
+        self._outcome = array('H')
+        self._xg_change = array('d')
+        self._extras: Dict[str, Dict[int, Any]] = {}  # name -> {event index: value}
+        self._last_success: Dict[Tuple[int, int], int] = {}  # (team, action) code -> index
+        
+    def _code(self, value: Any) -> int:
+        """Get the string-table code for a categorical value"""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
         
     def generate_possession_id(self, team: str, match_id: str = "M01") -> str:
         """Generate a unique possession ID"""
         self.possession_counter += 1
         return f"{match_id}-{team[0]}{self.possession_counter:03d}"
     
-    def add(self, event_dict: Dict[str, Any]) -> None:
-        """Add an event to the buffer"""
-        # Ensure timestamp is in ISO format
-        if 'timestamp' not in event_dict:
-            event_dict['timestamp'] = datetime.now(timezone.utc).isoformat()
-        
-        # Validate required fields
-        required_fields = ['possession_id', 'timestamp', 'team', 'player_id', 
-                          'action', 'zone', 'pressure', 'team_status', 'outcome']
-        for field in required_fields:
-            if field not in event_dict:
-                event_dict[field] = None
-                
-        # Add xg_change if not present
-        if 'xg_change' not in event_dict:
-            event_dict['xg_change'] = 0.0
-            
-        self.events.append(event_dict.copy())
+    def add(self, possession_id: str, team: str, player_id: int, action: str, zone: str,
+            pressure: int = 0, team_status: str = 'Tied', outcome: str = 'Success',
+            xg_change: float = 0.0, **extras: Any) -> None:
+        """Add an event to the buffer; keyword extras become extra columns"""
+        code = self._code
+        index = len(self._possession_id)
+        if outcome == 'Success':
+            self._last_success[(code(team), code(action))] = index
+        self._possession_id.append(possession_id)
+        self._timestamp.append(time.time())
+        self._team.append(code(team))
+        self._player_id.append(player_id)
+        self._action.append(code(action))
+        self._zone.append(code(zone))
+        self._pressure.append(pressure)
+        self._team_status.append(code(team_status))
+        self._outcome.append(code(outcome))
+        self._xg_change.append(xg_change)
+        for name, value in extras.items():
+            column = self._extras.get(name)
+            if column is None:
+                column = self._extras[name] = {}
+            column[index] = value
+    
+    def __len__(self) -> int:
+        return len(self._possession_id)
+    
+    def last_success_index(self, team: str, action: str) -> int:
+        """Index of the team's most recent successful event of this action (-1 if none)"""
+        team_code, action_code = self._codes.get(team), self._codes.get(action)
+        return self._last_success.get((team_code, action_code), -1)
+    
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Events as a list of dicts (built on access, safe to modify)"""
+        return self.head(len(self))
+    
+    def head(self, n: int = 10) -> List[Dict[str, Any]]:
+        """The first n events as dicts (only those n are built)"""
+        strings = self._strings
+        events = []
+        for i in range(min(n, len(self))):
+            # Key order as the model logged them (timestamp was appended last), so
+            # DataFrames built from these dicts keep the established column order
+            event = {
+                'possession_id': self._possession_id[i],
+                'team': strings[self._team[i]],
+                'player_id': self._player_id[i],
+                'action': strings[self._action[i]],
+                'zone': strings[self._zone[i]],
+                'pressure': self._pressure[i],
+                'team_status': strings[self._team_status[i]],
+                'outcome': strings[self._outcome[i]],
+                'xg_change': self._xg_change[i],
+                'timestamp': _iso_utc(self._timestamp[i]),
+            }
+            for name, column in self._extras.items():
+                if i in column:
+                    event[name] = column[i]
+            events.append(event)
+        return events
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """Build a DataFrame of all events (core columns first, then extras)"""
+        strings = np.array(self._strings, dtype=object)
+        df = pd.DataFrame({
+            'possession_id': self._possession_id,
+            'timestamp': [_iso_utc(t) for t in self._timestamp],
+            'team': strings[np.frombuffer(self._team, dtype=np.uint16)],
+            'player_id': np.frombuffer(self._player_id, dtype=np.int32).astype(np.int64),
+            'action': strings[np.frombuffer(self._action, dtype=np.uint16)],
+            'zone': strings[np.frombuffer(self._zone, dtype=np.uint16)],
+            'pressure': np.frombuffer(self._pressure, dtype=np.int8).astype(np.int64),
+            'team_status': strings[np.frombuffer(self._team_status, dtype=np.uint16)],
+            'outcome': strings[np.frombuffer(self._outcome, dtype=np.uint16)],
+            'xg_change': np.frombuffer(self._xg_change, dtype=np.float64).copy(),
+        })
+        for name, column in self._extras.items():
+            df[name] = pd.Series(list(column.values()), index=list(column.keys())).reindex(df.index)
+        return df
     
     def dump_csv(self, path: str) -> None:
         """Export events to CSV file"""
-        if not self.events:
+        if not len(self):
             print("No events to export")
             return
             
-        df = pd.DataFrame(self.events)
-        
-        # Ensure proper column order
-        columns = ['possession_id', 'timestamp', 'team', 'player_id', 'action', 
-                  'zone', 'pressure', 'team_status', 'outcome', 'xg_change']
-        
-        # Reorder columns, keeping extra columns at the end
-        existing_columns = [col for col in columns if col in df.columns]
-        extra_columns = [col for col in df.columns if col not in columns]
-        final_columns = existing_columns + extra_columns
-        
-        df = df[final_columns]
-        df.to_csv(path, index=False)
+        self.to_dataframe().to_csv(path, index=False)
         print(f"Events exported to CSV: {path}")
     
     def dump_xes(self, path: str) -> None:
         """Export events to XES format for PM4Py"""
-        if not self.events:
+        if not len(self):
             print("No events to export")
             return
             
+        import pm4py  # Heavy import (~0.5s), so only loaded when exporting XES
+        
         # Convert to DataFrame first
-        df = pd.DataFrame(self.events)
+        df = self.to_dataframe()
         
         # Convert timestamp to datetime if it's string
-        if df['timestamp'].dtype == 'object':
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
             df['timestamp'] = pd.to_datetime(df['timestamp'])
         
         # Rename columns for PM4Py compatibility
@@ -94,21 +183,35 @@ class EventLogger:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get basic statistics about logged events"""
-        if not self.events:
+        if not len(self):
             return {"total_events": 0}
             
-        df = pd.DataFrame(self.events)
+        strings = self._strings
+        home, away = self._codes.get('Home'), self._codes.get('Away')
+        xg_home = xg_away = 0.0
+        for team, xg in zip(self._team, self._xg_change):
+            if team == home:
+                xg_home += xg
+            elif team == away:
+                xg_away += xg
+        
         stats = {
-            "total_events": len(self.events),
-            "unique_possessions": df['possession_id'].nunique(),
-            "actions_breakdown": df['action'].value_counts().to_dict(),
-            "teams": df['team'].unique().tolist(),
-            "total_xg_home": df[(df['team'] == 'Home')]['xg_change'].sum(),
-            "total_xg_away": df[(df['team'] == 'Away')]['xg_change'].sum()
+            "total_events": len(self),
+            "unique_possessions": len(set(self._possession_id)),
+            "actions_breakdown": {strings[code]: count for code, count
+                                  in Counter(self._action).most_common()},
+            "teams": [strings[code] for code in dict.fromkeys(self._team)],
+            "total_xg_home": xg_home,
+            "total_xg_away": xg_away
         }
         return stats
     
     def clear(self) -> None:
         """Clear all events from buffer"""
-        self.events.clear()
+        self._reset_columns()
         self.possession_counter = 0
+
+
+def _iso_utc(epoch_seconds: float) -> str:
+    """Format an epoch timestamp as an ISO-8601 UTC string"""
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).isoformat()